@@ -0,0 +1,160 @@
+﻿from __future__ import annotations
+
+import argparse
+import http.client
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.oci_lb_readiness_reporter.analyzers import ReadinessAnalyzer  # noqa: E402
+from src.oci_lb_readiness_reporter.helpers import ReportIndex, ReportQueryServer, write_json_report  # noqa: E402
+from src.oci_lb_readiness_reporter.models import CompartmentInfo  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the local readiness query server.")
+    parser.add_argument("--report", help="JSON report to serve (default: generate a synthetic report).")
+    parser.add_argument("--load-balancers", type=int, default=2000, help="LBs in the synthetic report.")
+    parser.add_argument("--backends-per-lb", type=int, default=20, help="Backends per LB in the synthetic report.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent keep-alive client connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Load-test duration in seconds.")
+    return parser.parse_args()
+
+
+def build_synthetic_report(lb_count: int, backends_per_lb: int, output_path: Path) -> None:
+    rows: list[dict[str, Any]] = []
+    for lb_index in range(lb_count):
+        backends = [
+            {
+                "name": f"10.{lb_index // 250}.{lb_index % 250}.{item}:8080",
+                "ip_address": f"10.{lb_index // 250}.{lb_index % 250}.{item}",
+                "port": 8080,
+                "health_status": "OK" if item % 10 else "CRITICAL",
+                "mapped_instance_id": f"ocid1.instance.oc1..bench{lb_index}x{item}",
+            }
+            for item in range(backends_per_lb)
+        ]
+        rows.append(
+            {
+                "load_balancer_id": f"ocid1.loadbalancer.oc1..bench{lb_index}",
+                "display_name": f"bench-lb-{lb_index}",
+                "lifecycle_state": "ACTIVE",
+                "is_private": bool(lb_index % 2),
+                "listener_count": 1,
+                "listeners": [],
+                "backend_set_count": 1,
+                "backend_count": len(backends),
+                "backend_sets": [
+                    {"name": "bs", "policy": "ROUND_ROBIN", "health_status": "OK", "backends": backends},
+                ],
+            }
+        )
+
+    report = ReadinessAnalyzer().analyze(
+        generated_at=datetime.now(timezone.utc),
+        region="bench-region-1",
+        tenancy_ocid="ocid1.tenancy.oc1..bench",
+        scanned_compartments=[
+            {
+                "compartment": CompartmentInfo(id="ocid1.compartment.oc1..bench", name="bench"),
+                "infra": {"instance_count": 0, "vnic_attachment_count": 0},
+                "load_balancers": rows,
+            }
+        ],
+        skipped_compartments=[],
+    )
+    write_json_report(report, output_path)
+
+
+def query_paths(index: ReportIndex, lb_count: int, backends_per_lb: int) -> list[str]:
+    rnd = random.Random(0)
+    paths = ["/summary"]
+    for _ in range(1000):
+        lb_index = rnd.randrange(lb_count)
+        backend = rnd.randrange(backends_per_lb)
+        paths.append(f"/backends?ip=10.{lb_index // 250}.{lb_index % 250}.{backend}")
+        paths.append(f"/load-balancers?name=bench-lb-{lb_index}")
+        paths.append(f"/backends?instance_id=ocid1.instance.oc1..bench{lb_index}x{backend}")
+    return paths
+
+
+def time_index_lookups(index: ReportIndex, paths: list[str]) -> None:
+    ips = [item.split("=", 1)[1] for item in paths if item.startswith("/backends?ip=")]
+    started = time.perf_counter()
+    for ip in ips:
+        index.backends_by_ip(ip)
+    elapsed = time.perf_counter() - started
+    print(f"In-process backend IP lookup: {elapsed / len(ips) * 1e6:.2f} us/lookup")
+
+
+def run_client(host: str, port: int, paths: list[str], deadline: float, latencies: list[float]) -> None:
+    connection = http.client.HTTPConnection(host, port)
+    rnd = random.Random(threading.get_ident())
+    local: list[float] = []
+    while time.perf_counter() < deadline:
+        path = rnd.choice(paths)
+        started = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        local.append(time.perf_counter() - started)
+    connection.close()
+    latencies.extend(local)
+
+
+def main() -> int:
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.report:
+            report_path = Path(args.report)
+        else:
+            report_path = Path(temp_dir) / "lb_readiness_report_bench.json"
+            build_synthetic_report(args.load_balancers, args.backends_per_lb, report_path)
+
+        started = time.perf_counter()
+        index = ReportIndex(report_path)
+        print(f"Index build: {time.perf_counter() - started:.3f}s for {index.load_balancer_count} load balancers")
+
+        paths = query_paths(index, args.load_balancers, args.backends_per_lb)
+        time_index_lookups(index, paths)
+
+        server = ReportQueryServer(("127.0.0.1", 0), index)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        port = server.server_address[1]
+
+        latencies: list[float] = []
+        deadline = time.perf_counter() + args.duration
+        clients = [
+            threading.Thread(target=run_client, args=("127.0.0.1", port, paths, deadline, latencies))
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+        server.shutdown()
+        server.server_close()
+
+    latencies.sort()
+    print(f"Requests: {len(latencies)} over {args.duration:.1f}s with {args.clients} clients")
+    print(f"Throughput: {len(latencies) / args.duration:.0f} req/s")
+    print(
+        f"Latency: p50 {statistics.median(latencies) * 1000:.3f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,4 @@
 ﻿from .readiness_analyzer import ReadinessAnalyzer
+from .report_differ import ReportDiffer
 
-__all__ = ["ReadinessAnalyzer"]
+__all__ = ["ReadinessAnalyzer", "ReportDiffer"]
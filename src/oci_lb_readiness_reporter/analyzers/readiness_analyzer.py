@@ -4,6 +4,8 @@ from collections import Counter
 from datetime import datetime, timezone
 from typing import Any
 
+from ..helpers.cidr_index import NETWORK_MATCH_OUTSIDE
+
 
 class ReadinessAnalyzer:
     def analyze(
@@ -13,6 +15,8 @@ class ReadinessAnalyzer:
         tenancy_ocid: str,
         scanned_compartments: list[dict[str, Any]],
         skipped_compartments: list[dict[str, str]],
+        coverage: dict[str, Any] | None = None,
+        circuit_breakers: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         lb_rows: list[dict[str, Any]] = []
 
@@ -21,6 +25,8 @@ class ReadinessAnalyzer:
         total_listeners = 0
         total_backend_sets = 0
         total_backends = 0
+        outside_subnet_backends = 0
+        max_snapshot_skew = None
         private_lb_count = 0
         public_lb_count = 0
 
@@ -50,6 +56,12 @@ class ReadinessAnalyzer:
                     backend_set_status_counter[item["health_status"]] += 1
                     for backend in item["backends"]:
                         backend_status_counter[backend["health_status"]] += 1
+                        if backend.get("network_match") == NETWORK_MATCH_OUTSIDE:
+                            outside_subnet_backends += 1
+
+                skew_seconds = (lb.get("health_snapshot") or {}).get("skew_seconds")
+                if skew_seconds is not None and (max_snapshot_skew is None or skew_seconds > max_snapshot_skew):
+                    max_snapshot_skew = skew_seconds
 
                 lb["infra_context"] = {
                     "instance_count_in_compartment": infra["instance_count"],
@@ -59,7 +71,8 @@ class ReadinessAnalyzer:
         issue_lbs = [
             row
             for row in lb_rows
-            if any(bs["health_status"] not in {"OK"} for bs in row["backend_sets"])
+            if row.get("collection_status", "OK") != "OK"
+            or any(bs["health_status"] not in {"OK"} for bs in row["backend_sets"])
         ]
 
         issue_lbs.sort(
@@ -89,8 +102,14 @@ class ReadinessAnalyzer:
                 "backend_set_health_status_counts": dict(backend_set_status_counter),
                 "backend_health_status_counts": dict(backend_status_counter),
                 "load_balancers_with_issues": len(issue_lbs),
+                "backends_outside_known_subnets": outside_subnet_backends,
+                "max_health_snapshot_skew_seconds": max_snapshot_skew,
+                "scan_complete": coverage["complete"] if coverage else True,
+                "open_circuit_count": len(circuit_breakers or []),
             },
+            "coverage": coverage,
+            "circuit_breakers": circuit_breakers or [],
             "skipped_compartments": skipped_compartments,
             "issue_load_balancers": issue_lbs,
             "load_balancers": lb_rows,
-        }
+        }
@@ -0,0 +1,169 @@
+﻿from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from ..helpers.report_stream import iter_report_items
+
+
+def _index_backend_sets(lb: dict[str, Any]) -> dict[str, tuple[str, dict[str, tuple[str, str | None]]]]:
+    index: dict[str, tuple[str, dict[str, tuple[str, str | None]]]] = {}
+    for backend_set in lb.get("backend_sets", []) or []:
+        backends = {
+            backend["name"]: (backend.get("health_status"), backend.get("mapped_instance_id"))
+            for backend in backend_set.get("backends", []) or []
+        }
+        index[backend_set["name"]] = (backend_set.get("health_status"), backends)
+    return index
+
+
+def _lb_identity(lb: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "load_balancer_id": lb["load_balancer_id"],
+        "display_name": lb.get("display_name"),
+        "compartment_id": lb.get("compartment_id"),
+        "compartment_name": lb.get("compartment_name"),
+    }
+
+
+class ReportDiffer:
+    def diff(self, base_report_path: Path, current_report_path: Path) -> dict[str, Any]:
+        base_metadata: dict[str, Any] = {}
+        base_index: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+
+        for key, value in iter_report_items(base_report_path):
+            if key == "metadata":
+                base_metadata = value
+            elif key == "load_balancers":
+                base_index[value["load_balancer_id"]] = (_lb_identity(value), _index_backend_sets(value))
+
+        current_metadata: dict[str, Any] = {}
+        unscanned_lb_ids: set[str] = set()
+        unscanned_compartment_ids: set[str] = set()
+        not_scanned_lbs: list[dict[str, Any]] = []
+        added_lbs: list[dict[str, Any]] = []
+        health_changes: list[dict[str, Any]] = []
+        mapping_changes: list[dict[str, Any]] = []
+        unchanged_lb_count = 0
+
+        for key, value in iter_report_items(current_report_path):
+            if key == "metadata":
+                current_metadata = value
+                continue
+            if key == "coverage" and value:
+                unscanned_lb_ids.update(value.get("unscanned_load_balancer_ids", []))
+                unscanned_compartment_ids.update(value.get("unlisted_compartment_ids", []))
+                continue
+            if key == "skipped_compartments":
+                unscanned_compartment_ids.add(value["compartment_id"])
+                continue
+            if key != "load_balancers":
+                continue
+
+            identity = _lb_identity(value)
+            previous = base_index.pop(identity["load_balancer_id"], None)
+            if previous is None:
+                added_lbs.append(identity)
+                continue
+            if value.get("collection_status", "OK") != "OK":
+                # Placeholder row for an LB whose details could not be fetched; nothing to compare.
+                not_scanned_lbs.append(identity)
+                continue
+
+            change_count = len(health_changes) + len(mapping_changes)
+            self._diff_backend_sets(
+                identity=identity,
+                previous_sets=previous[1],
+                current_sets=_index_backend_sets(value),
+                health_changes=health_changes,
+                mapping_changes=mapping_changes,
+            )
+            if change_count == len(health_changes) + len(mapping_changes):
+                unchanged_lb_count += 1
+
+        # A partial current report says nothing about LBs it never reached, so those are not removals.
+        removed_lbs: list[dict[str, Any]] = []
+        for identity, _ in base_index.values():
+            if identity["load_balancer_id"] in unscanned_lb_ids or identity["compartment_id"] in unscanned_compartment_ids:
+                not_scanned_lbs.append(identity)
+            else:
+                removed_lbs.append(identity)
+
+        return {
+            "metadata": {
+                "report_name": "load_balancer_readiness_diff",
+                "base_report": base_report_path.name,
+                "base_generated_at_utc": base_metadata.get("generated_at_utc"),
+                "current_report": current_report_path.name,
+                "current_generated_at_utc": current_metadata.get("generated_at_utc"),
+                "region": current_metadata.get("region"),
+                "tenancy_ocid": current_metadata.get("tenancy_ocid"),
+            },
+            "summary": {
+                "added_load_balancers": len(added_lbs),
+                "removed_load_balancers": len(removed_lbs),
+                "not_scanned_load_balancers": len(not_scanned_lbs),
+                "unchanged_load_balancers": unchanged_lb_count,
+                "health_changes": len(health_changes),
+                "instance_mapping_changes": len(mapping_changes),
+            },
+            "added_load_balancers": added_lbs,
+            "removed_load_balancers": removed_lbs,
+            "not_scanned_load_balancers": not_scanned_lbs,
+            "health_changes": health_changes,
+            "instance_mapping_changes": mapping_changes,
+        }
+
+    def _diff_backend_sets(
+        self,
+        identity: dict[str, Any],
+        previous_sets: dict[str, tuple[str, dict[str, tuple[str, str | None]]]],
+        current_sets: dict[str, tuple[str, dict[str, tuple[str, str | None]]]],
+        health_changes: list[dict[str, Any]],
+        mapping_changes: list[dict[str, Any]],
+    ) -> None:
+        lb_ref = {
+            "load_balancer_id": identity["load_balancer_id"],
+            "display_name": identity["display_name"],
+        }
+
+        for backend_set_name in sorted(previous_sets.keys() | current_sets.keys()):
+            previous_status, previous_backends = previous_sets.get(backend_set_name, (None, {}))
+            current_status, current_backends = current_sets.get(backend_set_name, (None, {}))
+
+            if previous_status != current_status:
+                health_changes.append(
+                    {
+                        **lb_ref,
+                        "backend_set": backend_set_name,
+                        "backend": None,
+                        "previous_status": previous_status,
+                        "current_status": current_status,
+                    }
+                )
+
+            for backend_name in sorted(previous_backends.keys() | current_backends.keys()):
+                previous_health, previous_instance = previous_backends.get(backend_name, (None, None))
+                current_health, current_instance = current_backends.get(backend_name, (None, None))
+
+                if previous_health != current_health:
+                    health_changes.append(
+                        {
+                            **lb_ref,
+                            "backend_set": backend_set_name,
+                            "backend": backend_name,
+                            "previous_status": previous_health,
+                            "current_status": current_health,
+                        }
+                    )
+
+                if previous_instance != current_instance and backend_name in previous_backends and backend_name in current_backends:
+                    mapping_changes.append(
+                        {
+                            **lb_ref,
+                            "backend_set": backend_set_name,
+                            "backend": backend_name,
+                            "previous_instance_id": previous_instance,
+                            "current_instance_id": current_instance,
+                        }
+                    )
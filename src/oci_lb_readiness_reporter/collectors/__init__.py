@@ -1,5 +1,6 @@
 ﻿from .identity_collector import IdentityCollector
 from .infra_collector import InfraCollector
 from .load_balancer_collector import LoadBalancerCollector
+from .network_reference_resolver import NetworkReferenceResolver
 
-__all__ = ["IdentityCollector", "LoadBalancerCollector", "InfraCollector"]
+__all__ = ["IdentityCollector", "LoadBalancerCollector", "InfraCollector", "NetworkReferenceResolver"]
@@ -6,12 +6,64 @@ from typing import Any
 from oci.pagination import list_call_get_all_results
 
 
+def _subnet_cidr_blocks(subnet: Any) -> list[str]:
+    blocks: list[str] = []
+    candidates = [
+        getattr(subnet, "cidr_block", None),
+        *(getattr(subnet, "ipv4_cidr_blocks", None) or []),
+        getattr(subnet, "ipv6_cidr_block", None),
+        *(getattr(subnet, "ipv6_cidr_blocks", None) or []),
+    ]
+    for block in candidates:
+        if block and block not in blocks:
+            blocks.append(block)
+    return blocks
+
+
+def subnet_metadata(subnet: Any) -> dict[str, Any]:
+    return {
+        "id": subnet.id,
+        "display_name": subnet.display_name,
+        "cidr_block": getattr(subnet, "cidr_block", ""),
+        "cidr_blocks": _subnet_cidr_blocks(subnet),
+        "vcn_id": subnet.vcn_id,
+    }
+
+
+def nsg_metadata(nsg: Any) -> dict[str, Any]:
+    return {
+        "id": nsg.id,
+        "display_name": nsg.display_name,
+        "vcn_id": nsg.vcn_id,
+    }
+
+
 class InfraCollector:
     def __init__(self, compute_client: Any, network_client: Any) -> None:
         self.compute_client = compute_client
         self.network_client = network_client
 
-    def build_context(self, compartment_ocid: str) -> dict[str, Any]:
+    def list_subnets(self, compartment_ocid: str) -> dict[str, dict[str, Any]]:
+        subnets = list_call_get_all_results(
+            self.network_client.list_subnets,
+            compartment_id=compartment_ocid,
+        ).data
+
+        return {subnet.id: subnet_metadata(subnet) for subnet in subnets}
+
+    def list_nsgs(self, compartment_ocid: str) -> dict[str, dict[str, Any]]:
+        nsgs = list_call_get_all_results(
+            self.network_client.list_network_security_groups,
+            compartment_id=compartment_ocid,
+        ).data
+
+        return {nsg.id: nsg_metadata(nsg) for nsg in nsgs}
+
+    def build_context(
+        self,
+        compartment_ocid: str,
+        subnet_by_id: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
         instances = list_call_get_all_results(
             self.compute_client.list_instances,
             compartment_id=compartment_ocid,
@@ -44,34 +96,10 @@ class InfraCollector:
                 "subnet_id": getattr(vnic, "subnet_id", ""),
             }
 
-        subnets = list_call_get_all_results(
-            self.network_client.list_subnets,
-            compartment_id=compartment_ocid,
-        ).data
-
-        subnet_by_id = {
-            subnet.id: {
-                "id": subnet.id,
-                "display_name": subnet.display_name,
-                "cidr_block": getattr(subnet, "cidr_block", ""),
-                "vcn_id": subnet.vcn_id,
-            }
-            for subnet in subnets
-        }
-
-        nsgs = list_call_get_all_results(
-            self.network_client.list_network_security_groups,
-            compartment_id=compartment_ocid,
-        ).data
+        if subnet_by_id is None:
+            subnet_by_id = self.list_subnets(compartment_ocid)
 
-        nsg_by_id = {
-            nsg.id: {
-                "id": nsg.id,
-                "display_name": nsg.display_name,
-                "vcn_id": nsg.vcn_id,
-            }
-            for nsg in nsgs
-        }
+        nsg_by_id = self.list_nsgs(compartment_ocid)
 
         instances_by_subnet: dict[str, int] = defaultdict(int)
         for item in ip_to_instance.values():
@@ -86,4 +114,4 @@ class InfraCollector:
             "subnet_by_id": subnet_by_id,
             "nsg_by_id": nsg_by_id,
             "instances_by_subnet": dict(instances_by_subnet),
-        }
+        }
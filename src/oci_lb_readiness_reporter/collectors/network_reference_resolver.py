@@ -0,0 +1,91 @@
+﻿from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from oci.exceptions import ServiceError
+
+from .infra_collector import nsg_metadata, subnet_metadata
+
+SUBNET = "subnet"
+NSG = "nsg"
+
+
+class NetworkReferenceResolver:
+    def __init__(self, network_client: Any, max_workers: int = 4) -> None:
+        self.network_client = network_client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="network-resolver")
+        self._lock = threading.Lock()
+        self._cache: dict[tuple[str, str], Future] = {}
+        self._fetchers: dict[str, Callable[[str], dict[str, Any]]] = {
+            SUBNET: self._fetch_subnet,
+            NSG: self._fetch_nsg,
+        }
+        self.fetch_counts: dict[str, int] = {SUBNET: 0, NSG: 0}
+
+    def seed_subnets(self, subnet_by_id: dict[str, dict[str, Any]]) -> None:
+        self._seed(SUBNET, subnet_by_id)
+
+    def seed_nsgs(self, nsg_by_id: dict[str, dict[str, Any]]) -> None:
+        self._seed(NSG, nsg_by_id)
+
+    def _seed(self, kind: str, meta_by_id: dict[str, dict[str, Any]]) -> None:
+        with self._lock:
+            for resource_id, meta in meta_by_id.items():
+                if (kind, resource_id) not in self._cache:
+                    future: Future = Future()
+                    future.set_result(meta)
+                    self._cache[(kind, resource_id)] = future
+
+    def resolve_subnets(self, subnet_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return self._resolve(SUBNET, subnet_ids)
+
+    def resolve_nsgs(self, nsg_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return self._resolve(NSG, nsg_ids)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _resolve(self, kind: str, resource_ids: list[str]) -> dict[str, dict[str, Any]]:
+        # Every id maps to one shared future, so concurrent callers asking for the same unknown
+        # OCID wait on a single API call and the result is memoized for the rest of the run.
+        futures: dict[str, Future] = {}
+        with self._lock:
+            for resource_id in dict.fromkeys(resource_ids):
+                key = (kind, resource_id)
+                future = self._cache.get(key)
+                if future is None:
+                    future = self._executor.submit(self._fetch, kind, resource_id)
+                    self._cache[key] = future
+                futures[resource_id] = future
+
+        resolved: dict[str, dict[str, Any]] = {}
+        for resource_id, future in futures.items():
+            meta = future.result()
+            if meta is not None:
+                resolved[resource_id] = meta
+        return resolved
+
+    def _fetch(self, kind: str, resource_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            self.fetch_counts[kind] += 1
+        try:
+            return self._fetchers[kind](resource_id)
+        except ServiceError as exc:
+            if exc.status not in {401, 403, 404}:
+                with self._lock:
+                    self._cache.pop((kind, resource_id), None)
+            print(f"[WARN] Failed to resolve {kind} {resource_id}: {exc.status} {exc.code}")
+            return None
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self._cache.pop((kind, resource_id), None)
+            print(f"[WARN] Failed to resolve {kind} {resource_id}: {exc}")
+            return None
+
+    def _fetch_subnet(self, subnet_id: str) -> dict[str, Any]:
+        return subnet_metadata(self.network_client.get_subnet(subnet_id=subnet_id).data)
+
+    def _fetch_nsg(self, nsg_id: str) -> dict[str, Any]:
+        return nsg_metadata(self.network_client.get_network_security_group(network_security_group_id=nsg_id).data)
@@ -13,6 +13,18 @@ def _to_bool(value: str | None, default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+def _to_float(value: str | None) -> float | None:
+    if value is None or not value.strip():
+        return None
+    return float(value)
+
+
+def _to_list(value: str | None) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
 @dataclass(frozen=True)
 class AppConfig:
     oci_config_file: str
@@ -26,6 +38,10 @@ class AppConfig:
     object_storage_prefix: str
     auto_discover_bucket: bool
     fail_on_upload_error: bool
+    scan_time_budget_seconds: float | None
+    critical_compartments: tuple[str, ...]
+    circuit_breaker_threshold: int
+    lb_health_fanout: int
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -47,4 +63,8 @@ class AppConfig:
             object_storage_prefix=os.getenv("OCI_OBJECT_STORAGE_PREFIX", "lb-readiness-report").strip("/"),
             auto_discover_bucket=_to_bool(os.getenv("OCI_AUTO_DISCOVER_BUCKET"), True),
             fail_on_upload_error=_to_bool(os.getenv("OCI_FAIL_ON_UPLOAD_ERROR"), True),
-        )
+            scan_time_budget_seconds=_to_float(os.getenv("OCI_SCAN_TIME_BUDGET_SECONDS")),
+            critical_compartments=_to_list(os.getenv("OCI_CRITICAL_COMPARTMENTS")),
+            circuit_breaker_threshold=int(os.getenv("OCI_CIRCUIT_BREAKER_THRESHOLD", "").strip() or 3),
+            lb_health_fanout=max(1, int(os.getenv("OCI_LB_HEALTH_FANOUT", "").strip() or 8)),
+        )
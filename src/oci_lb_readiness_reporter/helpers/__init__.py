@@ -1,4 +1,49 @@
-﻿from .object_storage_uploader import ObjectStorageUploader
-from .output_writer import write_json_report, write_markdown_report
+﻿from .cidr_index import NETWORK_MATCH_OUTSIDE, SubnetCidrIndex
+from .circuit_breaker import CIRCUIT_OPEN_STATUS, CircuitBreaker, CircuitOpenError
+from .object_storage_uploader import ObjectStorageUploader
+from .output_writer import (
+    write_backend_csv,
+    write_json_report,
+    write_listener_csv,
+    write_markdown_report,
+    write_report_artifacts,
+)
+from .profiler import PROFILE_MODES, PhaseProfiler
+from .query_server import ReportQueryServer, ReportWatcher
+from .report_index import ReportIndex
+from .report_stream import find_latest_report, iter_report_items
+from .scan_scheduler import (
+    ScanDeadline,
+    carry_over_issue_lb_ids,
+    lb_priority,
+    load_previous_scan_hints,
+    prioritize_compartments,
+)
+from .shard_queue import ShardQueue
 
-__all__ = ["ObjectStorageUploader", "write_json_report", "write_markdown_report"]
+__all__ = [
+    "CIRCUIT_OPEN_STATUS",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "NETWORK_MATCH_OUTSIDE",
+    "ObjectStorageUploader",
+    "PROFILE_MODES",
+    "PhaseProfiler",
+    "ReportIndex",
+    "ReportQueryServer",
+    "ReportWatcher",
+    "ScanDeadline",
+    "ShardQueue",
+    "SubnetCidrIndex",
+    "carry_over_issue_lb_ids",
+    "find_latest_report",
+    "iter_report_items",
+    "lb_priority",
+    "load_previous_scan_hints",
+    "prioritize_compartments",
+    "write_backend_csv",
+    "write_json_report",
+    "write_listener_csv",
+    "write_markdown_report",
+    "write_report_artifacts",
+]
@@ -0,0 +1,116 @@
+﻿from __future__ import annotations
+
+import ipaddress
+from bisect import bisect_right
+from typing import Any
+
+NETWORK_MATCH_SUBNET = "SUBNET"
+NETWORK_MATCH_AMBIGUOUS = "AMBIGUOUS"
+NETWORK_MATCH_OUTSIDE = "OUTSIDE_KNOWN_SUBNETS"
+NETWORK_MATCH_INVALID_IP = "INVALID_IP"
+
+
+def _parse_address(ip_address: str | None) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    try:
+        return ipaddress.ip_address((ip_address or "").split("%", 1)[0])
+    except ValueError:
+        return None
+
+
+class _IntervalTable:
+    def __init__(self) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.subnets: list[list[dict[str, Any]]] = []
+        self.parents: list[int] = []
+
+    def build(self, blocks: dict[tuple[int, int], list[dict[str, Any]]]) -> None:
+        # CIDR blocks are either disjoint or nested, so sorting by (start, -end) puts every
+        # block right after its enclosing block and a stack yields each block's parent.
+        ordered = sorted(blocks.items(), key=lambda item: (item[0][0], -item[0][1]))
+        stack: list[int] = []
+        for index, ((start, end), subnets) in enumerate(ordered):
+            while stack and self.ends[stack[-1]] < start:
+                stack.pop()
+            self.starts.append(start)
+            self.ends.append(end)
+            self.subnets.append(subnets)
+            self.parents.append(stack[-1] if stack else -1)
+            stack.append(index)
+
+    def lookup(self, value: int) -> list[dict[str, Any]]:
+        index = bisect_right(self.starts, value) - 1
+        while index >= 0:
+            if value <= self.ends[index]:
+                return self.subnets[index]
+            index = self.parents[index]
+        return []
+
+
+class SubnetCidrIndex:
+    def __init__(self) -> None:
+        self._blocks: dict[int, dict[tuple[int, int], list[dict[str, Any]]]] = {4: {}, 6: {}}
+        self._tables: dict[int, _IntervalTable] | None = None
+        self._subnet_ids: set[str] = set()
+
+    def add_subnet(self, subnet: dict[str, Any]) -> None:
+        if subnet["id"] in self._subnet_ids:
+            return
+        self._subnet_ids.add(subnet["id"])
+
+        for cidr in subnet.get("cidr_blocks", []):
+            try:
+                network = ipaddress.ip_network(cidr, strict=False)
+            except ValueError:
+                continue
+            key = (int(network.network_address), int(network.broadcast_address))
+            self._blocks[network.version].setdefault(key, []).append(
+                {
+                    "subnet_id": subnet["id"],
+                    "subnet_name": subnet.get("display_name"),
+                    "vcn_id": subnet.get("vcn_id"),
+                    "cidr_block": str(network),
+                }
+            )
+        self._tables = None
+
+    def build(self) -> None:
+        self._tables = {}
+        for version, blocks in self._blocks.items():
+            table = _IntervalTable()
+            table.build(blocks)
+            self._tables[version] = table
+
+    def lookup(self, ip_address: str | None) -> list[dict[str, Any]]:
+        address = _parse_address(ip_address)
+        if address is None:
+            return []
+        if self._tables is None:
+            self.build()
+        return self._tables[address.version].lookup(int(address))
+
+    def resolve(self, ip_address: str | None, preferred_vcn_ids: set[str]) -> dict[str, Any]:
+        unresolved = {
+            "network_match": NETWORK_MATCH_OUTSIDE,
+            "resolved_subnet_id": None,
+            "resolved_subnet_name": None,
+            "resolved_vcn_id": None,
+            "resolved_cidr_block": None,
+        }
+        if _parse_address(ip_address) is None:
+            return {**unresolved, "network_match": NETWORK_MATCH_INVALID_IP}
+
+        candidates = self.lookup(ip_address)
+        if not candidates:
+            return unresolved
+
+        # The same CIDR may exist in several VCNs; prefer the VCNs the LB itself is attached to.
+        preferred = [item for item in candidates if item["vcn_id"] in preferred_vcn_ids] or candidates
+        match = preferred[0]
+        return {
+            "network_match": NETWORK_MATCH_SUBNET if len(preferred) == 1 else NETWORK_MATCH_AMBIGUOUS,
+            "resolved_subnet_id": match["subnet_id"],
+            "resolved_subnet_name": match["subnet_name"],
+            "resolved_vcn_id": match["vcn_id"],
+            "resolved_cidr_block": match["cidr_block"],
+        }
@@ -0,0 +1,74 @@
+﻿from __future__ import annotations
+
+import threading
+from typing import Any, Callable, TypeVar
+
+from oci.exceptions import ServiceError
+
+T = TypeVar("T")
+
+CIRCUIT_OPEN_STATUS = "UNAVAILABLE (circuit open)"
+NON_RETRYABLE_STATUSES = {401, 403, 404}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int) -> None:
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._circuits: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def call(self, compartment_id: str, operation: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        key = (compartment_id, operation)
+        with self._lock:
+            circuit = self._circuits.setdefault(
+                key,
+                {"failures": 0, "open": False, "short_circuited_calls": 0, "last_error": None},
+            )
+            if circuit["open"]:
+                circuit["short_circuited_calls"] += 1
+                raise CircuitOpenError(f"{operation} disabled for compartment {compartment_id}: {circuit['last_error']}")
+
+        try:
+            result = func(*args, **kwargs)
+        except ServiceError as exc:
+            if exc.status in NON_RETRYABLE_STATUSES:
+                with self._lock:
+                    circuit["failures"] += 1
+                    circuit["last_error"] = f"{exc.status} {exc.code}"
+                    if circuit["failures"] >= self.failure_threshold and not circuit["open"]:
+                        circuit["open"] = True
+                        print(f"[WARN] Circuit opened for {operation} in compartment {compartment_id} ({circuit['last_error']}).")
+            raise
+
+        with self._lock:
+            circuit["failures"] = 0
+        return result
+
+    def headroom(self, compartment_id: str, operation: str) -> int | None:
+        # Failures the circuit can still absorb before opening; None once open, since every
+        # further call short-circuits without reaching the API.
+        with self._lock:
+            circuit = self._circuits.get((compartment_id, operation))
+            if circuit is None:
+                return self.failure_threshold
+            if circuit["open"]:
+                return None
+            return self.failure_threshold - circuit["failures"]
+
+    def report(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "compartment_id": compartment_id,
+                    "operation": operation,
+                    "failures": circuit["failures"],
+                    "short_circuited_calls": circuit["short_circuited_calls"],
+                    "last_error": circuit["last_error"],
+                }
+                for (compartment_id, operation), circuit in sorted(self._circuits.items())
+                if circuit["open"]
+            ]
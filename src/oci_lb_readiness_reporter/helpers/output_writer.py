@@ -1,18 +1,186 @@
 ﻿from __future__ import annotations
 
+import csv
+import io
 import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+BACKEND_CSV_COLUMNS = [
+    "compartment_id",
+    "compartment_name",
+    "load_balancer_id",
+    "load_balancer_name",
+    "lifecycle_state",
+    "is_private",
+    "backend_set_name",
+    "backend_set_policy",
+    "backend_set_health_status",
+    "backend_name",
+    "ip_address",
+    "port",
+    "weight",
+    "backup",
+    "drain",
+    "offline",
+    "health_status",
+    "health_error",
+    "health_checked_at_utc",
+    "mapped_instance_id",
+    "mapped_instance_name",
+    "mapped_vnic_id",
+    "mapped_subnet_id",
+    "network_match",
+    "resolved_subnet_id",
+    "resolved_subnet_name",
+    "resolved_vcn_id",
+    "resolved_cidr_block",
+]
 
-def write_json_report(report: dict[str, Any], output_path: Path) -> None:
+LISTENER_CSV_COLUMNS = [
+    "compartment_id",
+    "compartment_name",
+    "load_balancer_id",
+    "load_balancer_name",
+    "lifecycle_state",
+    "is_private",
+    "listener_name",
+    "protocol",
+    "port",
+    "default_backend_set_name",
+    "path_route_set_name",
+]
+
+# mkstemp creates files as 0600; reports get the same mode a plain open() would give them.
+# The umask can only be read by setting it, so do that once at import rather than from writer threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+_BACKEND_FIELDS = BACKEND_CSV_COLUMNS[BACKEND_CSV_COLUMNS.index("ip_address") :]
+_LISTENER_FIELDS = LISTENER_CSV_COLUMNS[LISTENER_CSV_COLUMNS.index("protocol") :]
+
+
+def _atomic_write_text(output_path: Path, content: str) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    fd, temp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as stream:
+            stream.write(content)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.chmod(temp_name, _FILE_MODE)
+        os.replace(temp_name, output_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _render_json(report: dict[str, Any]) -> str:
+    return json.dumps(report, indent=2)
+
+
+def _render_backend_csv(report: dict[str, Any]) -> str:
+    return _to_csv(BACKEND_CSV_COLUMNS, _backend_rows(report))
+
+
+def _render_listener_csv(report: dict[str, Any]) -> str:
+    return _to_csv(LISTENER_CSV_COLUMNS, _listener_rows(report))
+
+
+def write_json_report(report: dict[str, Any], output_path: Path) -> None:
+    _atomic_write_text(output_path, _render_json(report))
 
 
 def write_markdown_report(report: dict[str, Any], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(_to_markdown(report), encoding="utf-8")
+    _atomic_write_text(output_path, _to_markdown(report))
+
+
+def write_backend_csv(report: dict[str, Any], output_path: Path) -> None:
+    _atomic_write_text(output_path, _render_backend_csv(report))
+
+
+def write_listener_csv(report: dict[str, Any], output_path: Path) -> None:
+    _atomic_write_text(output_path, _render_listener_csv(report))
+
+
+def write_report_artifacts(report: dict[str, Any], output_dir: Path, base_name: str) -> dict[str, Path]:
+    renderers: dict[str, tuple[Callable[[dict[str, Any]], str], Path]] = {
+        "json": (_render_json, output_dir / f"{base_name}.json"),
+        "markdown": (_to_markdown, output_dir / f"{base_name}.md"),
+        "backends_csv": (_render_backend_csv, output_dir / f"{base_name}_backends.csv"),
+        "listeners_csv": (_render_listener_csv, output_dir / f"{base_name}_listeners.csv"),
+    }
+
+    # Rendering is pure Python and holds the GIL, so it runs serially; only the writes and
+    # fsyncs, which release it, overlap.
+    contents = {key: renderer(report) for key, (renderer, _) in renderers.items()}
+    with ThreadPoolExecutor(max_workers=len(renderers)) as executor:
+        futures = [executor.submit(_atomic_write_text, path, contents[key]) for key, (_, path) in renderers.items()]
+        for future in futures:
+            future.result()
+
+    return {key: path for key, (_, path) in renderers.items()}
+
+
+def _lb_columns(lb: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "compartment_id": lb.get("compartment_id"),
+        "compartment_name": lb.get("compartment_name"),
+        "load_balancer_id": lb["load_balancer_id"],
+        "load_balancer_name": lb["display_name"],
+        "lifecycle_state": lb["lifecycle_state"],
+        "is_private": lb["is_private"],
+    }
+
+
+def _backend_rows(report: dict[str, Any]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for lb in report["load_balancers"]:
+        lb_columns = _lb_columns(lb)
+        for backend_set in lb["backend_sets"]:
+            for backend in backend_set["backends"]:
+                rows.append(
+                    {
+                        **lb_columns,
+                        "backend_set_name": backend_set["name"],
+                        "backend_set_policy": backend_set["policy"],
+                        "backend_set_health_status": backend_set["health_status"],
+                        "backend_name": backend["name"],
+                        **{key: backend.get(key) for key in _BACKEND_FIELDS},
+                    }
+                )
+    return rows
+
+
+def _listener_rows(report: dict[str, Any]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for lb in report["load_balancers"]:
+        lb_columns = _lb_columns(lb)
+        for listener in lb["listeners"]:
+            rows.append(
+                {
+                    **lb_columns,
+                    "listener_name": listener["name"],
+                    **{key: listener.get(key) for key in _LISTENER_FIELDS},
+                }
+            )
+    return rows
+
+
+def _to_csv(columns: list[str], rows: list[dict[str, Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _or_dash(value: Any) -> Any:
+    return "-" if value is None else value
 
 
 def _to_markdown(report: dict[str, Any]) -> str:
@@ -41,8 +209,41 @@ def _to_markdown(report: dict[str, Any]) -> str:
     lines.append(f"| Backend Sets | {summary['total_backend_sets']} |")
     lines.append(f"| Backends | {summary['total_backends']} |")
     lines.append(f"| LBs with Issues | {summary['load_balancers_with_issues']} |")
+    lines.append(f"| Backends Outside Known Subnets | {summary.get('backends_outside_known_subnets', 0)} |")
+    lines.append(f"| Max Health Snapshot Skew (s) | {_or_dash(summary.get('max_health_snapshot_skew_seconds'))} |")
     lines.append("")
 
+    coverage = report.get("coverage")
+    if coverage and not coverage["complete"]:
+        lines.append("## Coverage")
+        lines.append("")
+        lines.append("> Partial report: not every load balancer was scanned (time budget, collection failures or open circuits).")
+        lines.append("")
+        lines.append("| Metric | Value |")
+        lines.append("|---|---:|")
+        lines.append(f"| Time Budget (s) | {coverage['time_budget_seconds']} |")
+        lines.append(f"| Elapsed (s) | {coverage['elapsed_seconds']} |")
+        lines.append(f"| Compartments Fully Scanned | {coverage['scanned_compartments']} / {coverage['total_compartments']} |")
+        lines.append(f"| Compartments Partially Scanned | {coverage.get('partially_scanned_compartments', 0)} |")
+        lines.append(
+            f"| LBs Scanned | {coverage['scanned_load_balancers']} / {coverage['discovered_load_balancers']} discovered |"
+        )
+        lines.append(f"| Compartments Not Listed | {len(coverage['unlisted_compartment_ids'])} |")
+        lines.append(f"| LBs Not Scanned | {len(coverage.get('unscanned_load_balancer_ids', []))} |")
+        lines.append("")
+
+    circuit_breakers = report.get("circuit_breakers") or []
+    if circuit_breakers:
+        lines.append("## Open Circuit Breakers")
+        lines.append("")
+        lines.append("| Compartment | Operation | Last Error | Short-circuited Calls |")
+        lines.append("|---|---|---|---:|")
+        for item in circuit_breakers:
+            lines.append(
+                f"| {item['compartment_id']} | {item['operation']} | {item['last_error']} | {item['short_circuited_calls']} |"
+            )
+        lines.append("")
+
     lines.append("## Backend Set Health Status")
     lines.append("")
     lines.append("| Status | Count |")
@@ -60,6 +261,8 @@ def _to_markdown(report: dict[str, Any]) -> str:
 
     for lb in issue_lbs[:50]:
         issue_sets = [f"{item['name']}:{item['health_status']}" for item in lb["backend_sets"] if item["health_status"] != "OK"]
+        if lb.get("collection_status", "OK") != "OK":
+            issue_sets.insert(0, lb["collection_status"])
         lines.append(
             f"| {lb['compartment_name']} | {lb['display_name']} | {lb['lifecycle_state']} | "
             f"{lb['is_private']} | {', '.join(issue_sets) if issue_sets else '-'} |"
@@ -68,9 +271,27 @@ def _to_markdown(report: dict[str, Any]) -> str:
     if not issue_lbs:
         lines.append("| - | - | - | - | No load balancer backend issues found. |")
 
+    lines.append("")
+    lines.append("## Health Snapshot Skew (Top 50)")
+    lines.append("")
+    lines.append("| Compartment | LB Name | Readings | First Reading (UTC) | Last Reading (UTC) | Skew (s) |")
+    lines.append("|---|---|---:|---|---|---:|")
+
+    snapshot_lbs = [lb for lb in report["load_balancers"] if (lb.get("health_snapshot") or {}).get("reading_count")]
+    snapshot_lbs.sort(key=lambda lb: lb["health_snapshot"]["skew_seconds"], reverse=True)
+    for lb in snapshot_lbs[:50]:
+        snapshot = lb["health_snapshot"]
+        lines.append(
+            f"| {lb['compartment_name']} | {lb['display_name']} | {snapshot['reading_count']} | "
+            f"{snapshot['first_reading_utc']} | {snapshot['last_reading_utc']} | {snapshot['skew_seconds']} |"
+        )
+
+    if not snapshot_lbs:
+        lines.append("| - | - | 0 | - | - | - |")
+
     lines.append("")
     lines.append("## Full Data")
     lines.append("")
     lines.append("- Full machine-readable details are available in the JSON artifact.")
 
-    return "\n".join(lines)
+    return "\n".join(lines)
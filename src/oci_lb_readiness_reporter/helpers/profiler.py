@@ -0,0 +1,167 @@
+﻿from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+PROFILE_MODES = ("sampling", "deterministic")
+_SAMPLE_INTERVAL_SECONDS = 0.005
+_IDLE_WAIT_FILES = ("/threading.py", "/queue.py", "/concurrent/futures/thread.py")
+
+FunctionKey = tuple[str, int, str]
+
+
+def _categorize(key: FunctionKey) -> str:
+    filename, _, funcname = key
+    path = filename.replace("\\", "/")
+    if "/oci_lb_readiness_reporter/" in path:
+        return "reporter"
+    if path.endswith(("/ssl.py", "/socket.py", "/selectors.py")) or (
+        path == "~" and any(token in funcname for token in ("_ssl.", "_socket.", "select.", "poll"))
+    ):
+        return "network_wait"
+    if "/oci/_vendor/" in path or "/urllib3/" in path or path.endswith("/http/client.py"):
+        return "http_client"
+    if "/oci/" in path:
+        return "sdk_deserialization" if "deserialize" in funcname or "/models/" in path else "oci_sdk"
+    return "other"
+
+
+def _format_key(key: FunctionKey) -> str:
+    filename, lineno, funcname = key
+    if filename == "~":
+        return funcname
+    return f"{Path(filename).name}:{lineno}({funcname})"
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.stop_event = threading.Event()
+        self.self_samples: Counter[FunctionKey] = Counter()
+        self.total_samples: Counter[FunctionKey] = Counter()
+        self.sample_count = 0
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self.stop_event.wait(_SAMPLE_INTERVAL_SECONDS):
+            self.sample_count += 1
+            for thread_id, frame in sys._current_frames().items():  # noqa: SLF001
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if code.co_filename.replace("\\", "/").endswith(_IDLE_WAIT_FILES):
+                    # Idle pool workers and lock waits would otherwise swamp the hotspot list.
+                    continue
+                self.self_samples[(code.co_filename, code.co_firstlineno, code.co_name)] += 1
+                seen: set[FunctionKey] = set()
+                while frame is not None:
+                    code = frame.f_code
+                    seen.add((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                self.total_samples.update(seen)
+
+
+class PhaseProfiler:
+    def __init__(self, mode: str | None, top_n: int = 25) -> None:
+        self.mode = mode
+        self.top_n = top_n
+        self.phases: list[dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.mode is None:
+            yield
+            return
+
+        started = time.perf_counter()
+        if self.mode == "deterministic":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                stats = pstats.Stats(profile)
+                self_times = {key: value[2] for key, value in stats.stats.items()}  # type: ignore[attr-defined]
+                total_times = {key: value[3] for key, value in stats.stats.items()}  # type: ignore[attr-defined]
+                self._record(name, started, self_times, total_times, profile=profile)
+        else:
+            sampler = _StackSampler()
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop_event.set()
+                sampler.join()
+                self_times = {key: count * _SAMPLE_INTERVAL_SECONDS for key, count in sampler.self_samples.items()}
+                total_times = {key: count * _SAMPLE_INTERVAL_SECONDS for key, count in sampler.total_samples.items()}
+                self._record(name, started, self_times, total_times, sample_count=sampler.sample_count)
+
+    def _record(
+        self,
+        name: str,
+        started: float,
+        self_times: dict[FunctionKey, float],
+        total_times: dict[FunctionKey, float],
+        profile: cProfile.Profile | None = None,
+        sample_count: int | None = None,
+    ) -> None:
+        category_times: Counter[str] = Counter()
+        for key, seconds in self_times.items():
+            category_times[_categorize(key)] += seconds
+
+        self.phases.append(
+            {
+                "name": name,
+                "wall_seconds": time.perf_counter() - started,
+                "self_times": self_times,
+                "total_times": total_times,
+                "category_times": category_times,
+                "profile": profile,
+                "sample_count": sample_count,
+            }
+        )
+
+    def write(self, output_dir: Path, base_name: str) -> list[Path]:
+        if self.mode is None or not self.phases:
+            return []
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+        lines = [f"Profile mode: {self.mode}", ""]
+
+        for phase in self.phases:
+            if phase["profile"] is not None:
+                profile_path = output_dir / f"{base_name}_profile_{phase['name']}.prof"
+                phase["profile"].dump_stats(str(profile_path))
+                written.append(profile_path)
+
+            lines.append(f"== Phase: {phase['name']} (wall {phase['wall_seconds']:.3f}s) ==")
+            if phase["profile"] is not None:
+                lines.append("cProfile traces the main thread only; pool work shows up as lock waits (use --profile sampling).")
+            if phase["sample_count"] is not None:
+                lines.append(f"Samples: {phase['sample_count']} at {_SAMPLE_INTERVAL_SECONDS * 1000:.0f} ms, all threads")
+            lines.append("Self time by category:")
+            category_total = sum(phase["category_times"].values()) or 1.0
+            for category, seconds in phase["category_times"].most_common():
+                lines.append(f"  {category:<20} {seconds:10.3f}s {seconds / category_total:6.1%}")
+
+            lines.append(f"Top {self.top_n} by self time:")
+            for key, seconds in sorted(phase["self_times"].items(), key=lambda item: item[1], reverse=True)[: self.top_n]:
+                lines.append(
+                    f"  {seconds:10.3f}s self {phase['total_times'].get(key, 0.0):10.3f}s total  "
+                    f"[{_categorize(key)}] {_format_key(key)}"
+                )
+            lines.append("")
+
+        summary_path = output_dir / f"{base_name}_profile.txt"
+        summary_path.write_text("\n".join(lines), encoding="utf-8")
+        written.append(summary_path)
+        return written
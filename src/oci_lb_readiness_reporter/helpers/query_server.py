@@ -0,0 +1,107 @@
+﻿from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .report_index import ReportIndex
+from .report_stream import find_latest_report
+
+
+class ReportQueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address: tuple[str, int], index: ReportIndex) -> None:
+        super().__init__(server_address, _QueryHandler)
+        self.index = index
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: ReportQueryServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        # Grab the index once so a concurrent reload cannot change it mid-request.
+        index = self.server.index
+
+        if path == "/health":
+            self._send(
+                200,
+                {
+                    "status": "ok",
+                    "report": index.report_path.name,
+                    "generated_at_utc": index.metadata.get("generated_at_utc"),
+                    "load_balancers": index.load_balancer_count,
+                },
+            )
+        elif path == "/summary":
+            self._send(200, {"metadata": index.metadata, "summary": index.summary, "coverage": index.coverage})
+        elif path.startswith("/load-balancers/"):
+            lb = index.load_balancer(unquote(path[len("/load-balancers/") :]))
+            if lb is None:
+                self._send(404, {"error": "load balancer not found"})
+            else:
+                self._send(200, lb)
+        elif path == "/load-balancers" and "name" in params:
+            self._send(200, {"load_balancers": index.load_balancers_by_name(params["name"])})
+        elif path == "/backends" and "ip" in params:
+            self._send(200, {"backends": index.backends_by_ip(params["ip"])})
+        elif path == "/backends" and "instance_id" in params:
+            self._send(200, {"backends": index.backends_by_instance(params["instance_id"])})
+        else:
+            self._send(404, {"error": f"unknown route: {url.path}"})
+
+    def _send(self, status: int, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class ReportWatcher(threading.Thread):
+    def __init__(
+        self,
+        server: ReportQueryServer,
+        output_dir: Path,
+        report_path: Path | None,
+        interval_seconds: float,
+    ) -> None:
+        super().__init__(name="report-watcher", daemon=True)
+        self.server = server
+        self.output_dir = output_dir
+        self.report_path = report_path
+        self.interval_seconds = interval_seconds
+        self.stop_event = threading.Event()
+        self._loaded = self._fingerprint(server.index.report_path)
+
+    def _fingerprint(self, path: Path) -> tuple[Path, int]:
+        return path, path.stat().st_mtime_ns
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval_seconds):
+            candidate = self.report_path or find_latest_report(self.output_dir)
+            if candidate is None:
+                continue
+            try:
+                fingerprint = self._fingerprint(candidate)
+                if fingerprint == self._loaded:
+                    continue
+                index = ReportIndex(candidate)
+            except Exception as exc:  # noqa: BLE001
+                print(f"[WARN] Failed to reload report {candidate}: {exc}")
+                continue
+            self.server.index = index
+            self._loaded = fingerprint
+            print(f"[INFO] Reloaded report: {candidate} ({index.load_balancer_count} load balancers)")
@@ -0,0 +1,72 @@
+﻿from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from .report_stream import iter_report_items
+
+
+class ReportIndex:
+    def __init__(self, report_path: Path) -> None:
+        self.report_path = report_path
+        self.metadata: dict[str, Any] = {}
+        self.summary: dict[str, Any] = {}
+        self.coverage: dict[str, Any] | None = None
+        self._lbs_by_id: dict[str, dict[str, Any]] = {}
+        self._lb_ids_by_name: dict[str, list[str]] = {}
+        self._backends_by_ip: dict[str, list[dict[str, Any]]] = {}
+        self._backends_by_instance: dict[str, list[dict[str, Any]]] = {}
+
+        for key, value in iter_report_items(report_path):
+            if key == "metadata":
+                self.metadata = value
+            elif key == "summary":
+                self.summary = value
+            elif key == "coverage":
+                self.coverage = value
+            elif key == "load_balancers":
+                self._add_load_balancer(value)
+
+    def _add_load_balancer(self, lb: dict[str, Any]) -> None:
+        lb_id = lb["load_balancer_id"]
+        lb["healthy"] = lb.get("collection_status", "OK") == "OK" and all(
+            item["health_status"] == "OK" for item in lb["backend_sets"]
+        )
+        self._lbs_by_id[lb_id] = lb
+        self._lb_ids_by_name.setdefault((lb["display_name"] or "").lower(), []).append(lb_id)
+
+        for backend_set in lb["backend_sets"]:
+            for backend in backend_set["backends"]:
+                entry = {
+                    "load_balancer_id": lb_id,
+                    "load_balancer_name": lb["display_name"],
+                    "backend_set": backend_set["name"],
+                    "backend_set_health_status": backend_set["health_status"],
+                    "backend": backend["name"],
+                    "ip_address": backend["ip_address"],
+                    "port": backend["port"],
+                    "health_status": backend["health_status"],
+                    "health_checked_at_utc": backend.get("health_checked_at_utc"),
+                    "healthy": backend["health_status"] == "OK",
+                    "mapped_instance_id": backend.get("mapped_instance_id"),
+                }
+                if backend["ip_address"]:
+                    self._backends_by_ip.setdefault(backend["ip_address"], []).append(entry)
+                if backend.get("mapped_instance_id"):
+                    self._backends_by_instance.setdefault(backend["mapped_instance_id"], []).append(entry)
+
+    @property
+    def load_balancer_count(self) -> int:
+        return len(self._lbs_by_id)
+
+    def load_balancer(self, lb_id: str) -> dict[str, Any] | None:
+        return self._lbs_by_id.get(lb_id)
+
+    def load_balancers_by_name(self, display_name: str) -> list[dict[str, Any]]:
+        return [self._lbs_by_id[item] for item in self._lb_ids_by_name.get(display_name.lower(), [])]
+
+    def backends_by_ip(self, ip_address: str) -> list[dict[str, Any]]:
+        return self._backends_by_ip.get(ip_address, [])
+
+    def backends_by_instance(self, instance_id: str) -> list[dict[str, Any]]:
+        return self._backends_by_instance.get(instance_id, [])
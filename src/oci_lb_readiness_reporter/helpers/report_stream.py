@@ -0,0 +1,107 @@
+﻿from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_DEFAULT_CHUNK_SIZE = 1 << 20
+_REPORT_GLOB = "lb_readiness_report_*.json"
+
+
+class _JsonStream:
+    def __init__(self, stream: TextIO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int) -> bool:
+        if self.eof:
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        chunk = self.stream.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(0):
+                raise ValueError("Unexpected end of JSON report")
+
+    def expect(self, token: str) -> None:
+        if self.peek() != token:
+            raise ValueError(f"Expected {token!r} in JSON report, found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value straddles the buffer boundary; grow the window and retry.
+                if not self._fill(len(self.buffer)):
+                    raise
+                continue
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                # A bare number or literal may continue in the next chunk.
+                if self._fill(0):
+                    continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_report_items(report_path: Path, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> Iterator[tuple[str, Any]]:
+    # Yields (key, value) for each top-level report section. Top-level arrays such as
+    # load_balancers are yielded one element at a time so large reports never have
+    # to be held in memory as a whole.
+    with report_path.open("r", encoding="utf-8-sig") as stream:
+        reader = _JsonStream(stream, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if reader.peek() == "[":
+                for item in reader.iter_array():
+                    yield key, item
+            else:
+                yield key, reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("}")
+            return
+
+
+def find_latest_report(output_dir: Path) -> Path | None:
+    if not output_dir.is_dir():
+        return None
+    candidates = sorted(output_dir.glob(_REPORT_GLOB))
+    return candidates[-1] if candidates else None
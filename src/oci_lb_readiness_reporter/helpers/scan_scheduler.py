@@ -0,0 +1,94 @@
+﻿from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+from ..models import CompartmentInfo
+from .report_stream import iter_report_items
+
+PRIORITY_PUBLIC_LB = 0
+PRIORITY_PREVIOUS_ISSUE = 1
+PRIORITY_CRITICAL_COMPARTMENT = 2
+PRIORITY_DEFAULT = 3
+
+
+class ScanDeadline:
+    def __init__(self, budget_seconds: float | None, started_at: float | None = None) -> None:
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic() if started_at is None else started_at
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        return self.budget_seconds is not None and self.elapsed() >= self.budget_seconds
+
+
+def load_previous_scan_hints(report_path: Path | None) -> dict[str, set[str]]:
+    hints: dict[str, set[str]] = {"issue_lb_ids": set(), "lb_compartment_ids": set()}
+    if report_path is None:
+        return hints
+
+    try:
+        for key, value in iter_report_items(report_path):
+            if key == "issue_load_balancers":
+                hints["issue_lb_ids"].add(value["load_balancer_id"])
+            elif key == "load_balancers" and value.get("compartment_id"):
+                hints["lb_compartment_ids"].add(value["compartment_id"])
+            elif key == "coverage" and value:
+                hints["issue_lb_ids"].update(value.get("carried_issue_load_balancer_ids", []))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[WARN] Ignoring unreadable previous report {report_path}: {exc}")
+        return {"issue_lb_ids": set(), "lb_compartment_ids": set()}
+
+    return hints
+
+
+def carry_over_issue_lb_ids(
+    previous_issue_lb_ids: set[str],
+    scanned_lb_ids: set[str],
+    unscanned_lb_ids: set[str],
+    complete: bool,
+) -> list[str]:
+    # Issue LBs from the previous report that this run never reached stay prioritized for the
+    # next one. After a complete scan an LB that was not discovered is gone, so it is dropped.
+    return sorted(
+        lb_id
+        for lb_id in previous_issue_lb_ids - scanned_lb_ids
+        if lb_id in unscanned_lb_ids or not complete
+    )
+
+
+def is_critical_compartment(compartment: CompartmentInfo, critical_compartments: tuple[str, ...]) -> bool:
+    return compartment.id in critical_compartments or compartment.name in critical_compartments
+
+
+def prioritize_compartments(
+    compartments: list[CompartmentInfo],
+    critical_compartments: tuple[str, ...],
+    previous_lb_compartment_ids: set[str],
+) -> list[CompartmentInfo]:
+    def rank(compartment: CompartmentInfo) -> int:
+        if is_critical_compartment(compartment, critical_compartments):
+            return 0
+        if compartment.id in previous_lb_compartment_ids:
+            return 1
+        return 2
+
+    return sorted(compartments, key=rank)
+
+
+def lb_priority(
+    lb_summary: Any,
+    compartment: CompartmentInfo,
+    previous_issue_lb_ids: set[str],
+    critical_compartments: tuple[str, ...],
+) -> int:
+    if not getattr(lb_summary, "is_private", False):
+        return PRIORITY_PUBLIC_LB
+    if lb_summary.id in previous_issue_lb_ids:
+        return PRIORITY_PREVIOUS_ISSUE
+    if is_critical_compartment(compartment, critical_compartments):
+        return PRIORITY_CRITICAL_COMPARTMENT
+    return PRIORITY_DEFAULT
@@ -0,0 +1,159 @@
+﻿from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .output_writer import write_json_report
+
+_JOB_FILE = "job.json"
+_NETWORK_SEED_FILE = "network_seed.json"
+_PENDING = "pending"
+_CLAIMED = "claimed"
+_RESULTS = "results"
+_FAILED = "failed"
+
+
+class ShardQueue:
+    # Work queue on a shared directory (NFS, SMB, FSS mount). A shard moves
+    # pending/ -> claimed/ -> results/ (or failed/ once it runs out of attempts); claims
+    # are atomic renames and workers keep their claim alive by touching the claimed file.
+    def __init__(self, queue_dir: Path) -> None:
+        self.queue_dir = queue_dir
+        self.job_path = queue_dir / _JOB_FILE
+        self.network_seed_path = queue_dir / _NETWORK_SEED_FILE
+        self.pending_dir = queue_dir / _PENDING
+        self.claimed_dir = queue_dir / _CLAIMED
+        self.results_dir = queue_dir / _RESULTS
+        self.failed_dir = queue_dir / _FAILED
+
+    def create_job(
+        self,
+        job: dict[str, Any],
+        shards: list[dict[str, Any]],
+        network_seed: dict[str, Any],
+    ) -> None:
+        for directory in (self.pending_dir, self.claimed_dir, self.results_dir, self.failed_dir):
+            if directory.exists():
+                shutil.rmtree(directory)
+            directory.mkdir(parents=True)
+
+        for shard in shards:
+            write_json_report({**shard, "attempt": 1}, self.pending_dir / f"{shard['shard_id']}.json")
+        # The tenancy-wide seed lives in its own file so polling job.json stays cheap.
+        write_json_report(network_seed, self.network_seed_path)
+        write_json_report(
+            {
+                **job,
+                "job_id": uuid.uuid4().hex,
+                "shard_ids": [item["shard_id"] for item in shards],
+                "complete": False,
+            },
+            self.job_path,
+        )
+
+    def read_job(self) -> dict[str, Any] | None:
+        try:
+            return json.loads(self.job_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def read_network_seed(self) -> dict[str, Any]:
+        return json.loads(self.network_seed_path.read_text(encoding="utf-8"))
+
+    def mark_complete(self) -> None:
+        job = self.read_job() or {}
+        write_json_report({**job, "complete": True}, self.job_path)
+
+    def claim(self) -> dict[str, Any] | None:
+        for pending_path in sorted(self.pending_dir.glob("*.json")):
+            claimed_path = self.claimed_dir / pending_path.name
+            try:
+                # Touch before the rename: a shard that waited in pending/ longer than the worker
+                # timeout would otherwise arrive in claimed/ looking stale already.
+                os.utime(pending_path)
+                os.replace(pending_path, claimed_path)
+                shard = json.loads(claimed_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue  # another worker won the rename, or the claim was re-queued
+            if self.has_result(shard["shard_id"]):
+                claimed_path.unlink(missing_ok=True)
+                continue
+            return shard
+        return None
+
+    def heartbeat(self, shard_id: str, interval_seconds: float) -> threading.Event:
+        stop_event = threading.Event()
+        claimed_path = self.claimed_dir / f"{shard_id}.json"
+
+        def beat() -> None:
+            while not stop_event.wait(interval_seconds):
+                try:
+                    os.utime(claimed_path)
+                except FileNotFoundError:
+                    return
+
+        threading.Thread(target=beat, name=f"heartbeat-{shard_id}", daemon=True).start()
+        return stop_event
+
+    def complete(self, shard_id: str, result: dict[str, Any]) -> None:
+        write_json_report(result, self.results_dir / f"{shard_id}.json")
+        (self.claimed_dir / f"{shard_id}.json").unlink(missing_ok=True)
+
+    def completed_ids(self) -> set[str]:
+        return {path.stem for path in self.results_dir.glob("*.json")}
+
+    def claimed_ids(self) -> set[str]:
+        return {path.stem for path in self.claimed_dir.glob("*.json")}
+
+    def failed_ids(self) -> set[str]:
+        return {path.stem for path in self.failed_dir.glob("*.json")}
+
+    def has_result(self, shard_id: str) -> bool:
+        return (self.results_dir / f"{shard_id}.json").exists()
+
+    def requeue_stale(self, timeout_seconds: float, max_attempts: int) -> tuple[list[str], list[str]]:
+        requeued: list[str] = []
+        abandoned: list[str] = []
+        now = time.time()
+        for claimed_path in sorted(self.claimed_dir.glob("*.json")):
+            try:
+                if now - claimed_path.stat().st_mtime < timeout_seconds:
+                    continue
+                shard = json.loads(claimed_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue
+            if self.has_result(shard["shard_id"]):
+                claimed_path.unlink(missing_ok=True)
+                continue
+
+            attempt = shard.get("attempt", 1)
+            try:
+                if attempt >= max_attempts:
+                    os.replace(claimed_path, self.failed_dir / claimed_path.name)
+                    abandoned.append(shard["shard_id"])
+                    continue
+                # Bump the attempt in place, then move the file with a single rename so a
+                # worker claiming it meanwhile can never have its live claim deleted.
+                write_json_report({**shard, "attempt": attempt + 1}, claimed_path)
+                os.replace(claimed_path, self.pending_dir / claimed_path.name)
+            except FileNotFoundError:
+                continue  # the worker finished and removed its claim
+            requeued.append(shard["shard_id"])
+        return requeued, abandoned
+
+    def load_results(self) -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        for result_path in sorted(self.results_dir.glob("*.json")):
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+            results[result["shard_id"]] = result
+        return results
+
+    def discard_pending(self) -> None:
+        for path in self.pending_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
@@ -1,17 +1,42 @@
 ﻿from __future__ import annotations
 
 import argparse
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from oci.exceptions import ServiceError
 
-from .analyzers import ReadinessAnalyzer
+from .analyzers import ReadinessAnalyzer, ReportDiffer
 from .clients import create_clients, create_oci_config
-from .collectors import IdentityCollector, InfraCollector, LoadBalancerCollector
+from .collectors import IdentityCollector, InfraCollector, LoadBalancerCollector, NetworkReferenceResolver
 from .config import AppConfig
-from .helpers import ObjectStorageUploader, write_json_report, write_markdown_report
+from .helpers import (
+    CIRCUIT_OPEN_STATUS,
+    PROFILE_MODES,
+    CircuitBreaker,
+    CircuitOpenError,
+    ObjectStorageUploader,
+    PhaseProfiler,
+    ReportIndex,
+    ReportQueryServer,
+    ReportWatcher,
+    ScanDeadline,
+    ShardQueue,
+    SubnetCidrIndex,
+    carry_over_issue_lb_ids,
+    find_latest_report,
+    lb_priority,
+    load_previous_scan_hints,
+    prioritize_compartments,
+    write_json_report,
+    write_report_artifacts,
+)
+from .models import CompartmentInfo
 
 
 def parse_args() -> argparse.Namespace:
@@ -21,6 +46,85 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Generate local reports only, do not upload to Object Storage.",
     )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop scanning after this many seconds and write a partial report with coverage details.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sampling",
+        choices=PROFILE_MODES,
+        help="Profile each scan phase (default mode: sampling, all threads) and write profiles next to the reports.",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("BASE_REPORT", "CURRENT_REPORT"),
+        help="Compare two existing JSON reports and write a delta artifact instead of scanning.",
+    )
+    parser.add_argument(
+        "--baseline-report",
+        help="JSON report to diff the new scan against; writes a delta artifact next to the reports.",
+    )
+    parser.add_argument(
+        "--upload-delta-only",
+        action="store_true",
+        help="Upload only the delta artifact (against --baseline-report or the latest local report).",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve read-only readiness queries over HTTP from the latest local report instead of scanning.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address for --serve (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8080, help="Port for --serve (default: 8080).")
+    parser.add_argument(
+        "--report",
+        help="JSON report to serve (default: latest report in the output directory).",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="With --serve, poll for a newer report every N seconds and reload it (default: disabled).",
+    )
+    parser.add_argument(
+        "--coordinator",
+        action="store_true",
+        help="Split the compartment list into shards on --queue-dir, wait for workers and publish the merged report.",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Take shards from --queue-dir, scan them and write shard results until the job completes.",
+    )
+    parser.add_argument("--queue-dir", help="Shared directory used as the coordinator/worker work queue.")
+    parser.add_argument("--shards", type=int, default=8, help="Number of shards for --coordinator (default: 8).")
+    parser.add_argument(
+        "--worker-timeout",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="Re-queue a claimed shard when its worker has not sent a heartbeat for this long (default: 300).",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Queue polling interval for --coordinator and --worker (default: 5).",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Give up on a shard after this many workers timed out on it (default: 3).",
+    )
+    parser.add_argument("--worker-id", help="Worker name recorded in shard results (default: <hostname>-<pid>).")
     return parser.parse_args()
 
 
@@ -90,12 +194,113 @@ def _map_nsgs(lb: Any, nsg_by_id: dict[str, dict[str, str]]) -> list[dict[str, A
     return rows
 
 
+def _read_health(
+    breaker: CircuitBreaker,
+    compartment_id: str,
+    operation: str,
+    func: Any,
+    *args: Any,
+) -> dict[str, Any]:
+    try:
+        health = breaker.call(compartment_id, operation, func, *args)
+    except CircuitOpenError as exc:
+        return {"status": CIRCUIT_OPEN_STATUS, "error": str(exc), "checked_at": None}
+    except Exception as exc:  # noqa: BLE001
+        return {"status": "UNAVAILABLE", "error": str(exc), "checked_at": None}
+    return {"status": getattr(health, "status", "UNKNOWN"), "error": None, "checked_at": datetime.now(timezone.utc)}
+
+
+def _read_health_batch(
+    breaker: CircuitBreaker,
+    compartment_id: str,
+    operation: str,
+    func: Any,
+    calls: dict[tuple[str, str | None], tuple[Any, ...]],
+    health_executor: ThreadPoolExecutor,
+) -> dict[tuple[str, str | None], dict[str, Any]]:
+    # Until a read succeeds, keep no more calls in flight than the breaker can still absorb, so an
+    # operation that fails everywhere opens its circuit after exactly the threshold. After the
+    # first success the rest fan out freely; the executor's worker count remains the bound.
+    results: dict[tuple[str, str | None], dict[str, Any]] = {}
+    queued = list(calls.items())
+    in_flight: dict[Future, tuple[str, str | None]] = {}
+    succeeded = False
+    while queued or in_flight:
+        headroom = breaker.headroom(compartment_id, operation)
+        limit = len(calls) if succeeded or headroom is None else max(1, headroom)
+        while queued and len(in_flight) < limit:
+            key, args = queued.pop(0)
+            in_flight[health_executor.submit(_read_health, breaker, compartment_id, operation, func, *args)] = key
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[in_flight.pop(future)] = future.result()
+            succeeded = succeeded or future.result()["checked_at"] is not None
+    return results
+
+
+def _poll_lb_health(
+    lb: Any,
+    lb_collector: LoadBalancerCollector,
+    compartment_id: str,
+    breaker: CircuitBreaker,
+    health_executor: ThreadPoolExecutor,
+) -> dict[tuple[str, str | None], dict[str, Any]]:
+    # Reads for one LB are fanned out so they describe (nearly) the same moment; the executor's
+    # worker count is the per-LB fan-out bound. Backend-set reads go first, then backend reads.
+    set_calls: dict[tuple[str, str | None], tuple[Any, ...]] = {}
+    backend_calls: dict[tuple[str, str | None], tuple[Any, ...]] = {}
+    for backend_set_name, backend_set in (getattr(lb, "backend_sets", {}) or {}).items():
+        set_calls[(backend_set_name, None)] = (lb.id, backend_set_name)
+        for backend in getattr(backend_set, "backends", []) or []:
+            backend_name = getattr(backend, "name", "UNKNOWN_BACKEND")
+            backend_calls[(backend_set_name, backend_name)] = (lb.id, backend_set_name, backend_name)
+
+    health = _read_health_batch(
+        breaker,
+        compartment_id,
+        "get_backend_set_health",
+        lb_collector.get_backend_set_health,
+        set_calls,
+        health_executor,
+    )
+    health.update(
+        _read_health_batch(
+            breaker,
+            compartment_id,
+            "get_backend_health",
+            lb_collector.get_backend_health,
+            backend_calls,
+            health_executor,
+        )
+    )
+    return health
+
+
+def _health_snapshot(readings: list[dict[str, Any]]) -> dict[str, Any]:
+    timestamps = sorted(item["checked_at"] for item in readings if item["checked_at"] is not None)
+    if not timestamps:
+        return {"reading_count": 0, "first_reading_utc": None, "last_reading_utc": None, "skew_seconds": None}
+    return {
+        "reading_count": len(timestamps),
+        "first_reading_utc": timestamps[0].isoformat(),
+        "last_reading_utc": timestamps[-1].isoformat(),
+        "skew_seconds": round((timestamps[-1] - timestamps[0]).total_seconds(), 3),
+    }
+
+
+def _checked_at(reading: dict[str, Any]) -> str | None:
+    return reading["checked_at"].isoformat() if reading["checked_at"] else None
+
+
 def _collect_lb_detail(
     lb: Any,
     lb_collector: LoadBalancerCollector,
+    compartment_id: str,
+    breaker: CircuitBreaker,
+    health_executor: ThreadPoolExecutor,
+    cidr_index: SubnetCidrIndex,
+    network_resolver: NetworkReferenceResolver,
     ip_to_instance: dict[str, dict[str, str]],
-    subnet_by_id: dict[str, dict[str, str]],
-    nsg_by_id: dict[str, dict[str, str]],
 ) -> dict[str, Any]:
     listeners = getattr(lb, "listeners", {}) or {}
     backend_sets = getattr(lb, "backend_sets", {}) or {}
@@ -114,33 +319,24 @@ def _collect_lb_detail(
 
     backend_set_rows = []
     backend_count = 0
+    subnet_by_id = network_resolver.resolve_subnets(getattr(lb, "subnet_ids", []) or [])
+    for subnet in subnet_by_id.values():
+        # Subnets fetched on demand live outside the listed compartments; the index ignores repeats.
+        cidr_index.add_subnet(subnet)
+    nsg_by_id = network_resolver.resolve_nsgs(getattr(lb, "network_security_group_ids", []) or [])
+    lb_vcn_ids = {meta["vcn_id"] for meta in subnet_by_id.values() if meta.get("vcn_id")}
 
-    for backend_set_name, backend_set in backend_sets.items():
-        try:
-            backend_set_health = lb_collector.get_backend_set_health(lb.id, backend_set_name)
-            backend_set_status = getattr(backend_set_health, "status", "UNKNOWN")
-        except Exception as exc:  # noqa: BLE001
-            backend_set_health = None
-            backend_set_status = "UNAVAILABLE"
-            backend_set_health_error = str(exc)
-        else:
-            backend_set_health_error = None
+    health = _poll_lb_health(lb, lb_collector, compartment_id, breaker, health_executor)
 
+    for backend_set_name, backend_set in backend_sets.items():
+        backend_set_reading = health[(backend_set_name, None)]
         backend_rows = []
 
         for backend in getattr(backend_set, "backends", []) or []:
             backend_count += 1
             backend_name = getattr(backend, "name", "UNKNOWN_BACKEND")
             backend_ip = getattr(backend, "ip_address", None)
-
-            try:
-                backend_health = lb_collector.get_backend_health(lb.id, backend_set_name, backend_name)
-                backend_status = getattr(backend_health, "status", "UNKNOWN")
-            except Exception as exc:  # noqa: BLE001
-                backend_status = "UNAVAILABLE"
-                backend_health_error = str(exc)
-            else:
-                backend_health_error = None
+            backend_reading = health[(backend_set_name, backend_name)]
 
             instance_meta = ip_to_instance.get(backend_ip or "", {})
 
@@ -153,12 +349,14 @@ def _collect_lb_detail(
                     "backup": getattr(backend, "backup", None),
                     "drain": getattr(backend, "drain", None),
                     "offline": getattr(backend, "offline", None),
-                    "health_status": backend_status,
-                    "health_error": backend_health_error,
+                    "health_status": backend_reading["status"],
+                    "health_error": backend_reading["error"],
+                    "health_checked_at_utc": _checked_at(backend_reading),
                     "mapped_instance_id": instance_meta.get("instance_id"),
                     "mapped_instance_name": instance_meta.get("instance_name"),
                     "mapped_vnic_id": instance_meta.get("vnic_id"),
                     "mapped_subnet_id": instance_meta.get("subnet_id"),
+                    **cidr_index.resolve(backend_ip, lb_vcn_ids),
                 }
             )
 
@@ -166,8 +364,9 @@ def _collect_lb_detail(
             {
                 "name": backend_set_name,
                 "policy": getattr(backend_set, "policy", None),
-                "health_status": backend_set_status,
-                "health_error": backend_set_health_error,
+                "health_status": backend_set_reading["status"],
+                "health_error": backend_set_reading["error"],
+                "health_checked_at_utc": _checked_at(backend_set_reading),
                 "backend_count": len(backend_rows),
                 "backends": backend_rows,
             }
@@ -188,12 +387,51 @@ def _collect_lb_detail(
         "backend_set_count": len(backend_set_rows),
         "backend_count": backend_count,
         "backend_sets": backend_set_rows,
+        "health_snapshot": _health_snapshot(list(health.values())),
+        "collection_status": "OK",
+        "collection_error": None,
+    }
+
+
+def _unavailable_lb_row(lb_summary: Any, status: str, error: str) -> dict[str, Any]:
+    # Stand-in for an LB whose details could not be fetched, so it still shows up as an issue.
+    return {
+        "load_balancer_id": lb_summary.id,
+        "display_name": lb_summary.display_name,
+        "lifecycle_state": getattr(lb_summary, "lifecycle_state", None) or "UNKNOWN",
+        "is_private": bool(getattr(lb_summary, "is_private", False)),
+        "shape_name": getattr(lb_summary, "shape_name", None),
+        "time_created": None,
+        "ip_addresses": _map_lb_ip_addresses(lb_summary),
+        "subnets": [],
+        "network_security_groups": [],
+        "listener_count": 0,
+        "listeners": [],
+        "backend_set_count": 0,
+        "backend_count": 0,
+        "backend_sets": [],
+        "health_snapshot": _health_snapshot([]),
+        "collection_status": status,
+        "collection_error": error,
     }
 
 
 def main() -> int:
+    started_at = time.monotonic()
     args = parse_args()
 
+    if args.diff:
+        return run_diff(args)
+    if args.serve:
+        return run_serve(args)
+    if (args.coordinator or args.worker) and not args.queue_dir:
+        print("[ERROR] --coordinator and --worker require --queue-dir.")
+        return 1
+    if args.coordinator:
+        return run_coordinator(args)
+    if args.worker:
+        return run_worker(args)
+
     try:
         app_config = AppConfig.from_env()
         oci_config = create_oci_config(app_config)
@@ -203,106 +441,337 @@ def main() -> int:
         return 1
 
     identity_collector = IdentityCollector(clients["identity"])
-    lb_collector = LoadBalancerCollector(clients["load_balancer"])
-    infra_collector = InfraCollector(clients["compute"], clients["network"])
 
     tenancy_ocid = oci_config["tenancy"]
     region = oci_config["region"]
+    profiler = PhaseProfiler(args.profile)
 
-    try:
-        compartments = identity_collector.list_compartments(
-            tenancy_ocid=tenancy_ocid,
-            root_compartment_ocid=app_config.root_compartment_ocid,
-            include_subcompartments=app_config.include_subcompartments,
-        )
-    except Exception as exc:  # noqa: BLE001
-        print(f"[ERROR] Failed to list compartments: {exc}")
-        return 1
+    with profiler.phase("compartment_discovery"):
+        try:
+            compartments = identity_collector.list_compartments(
+                tenancy_ocid=tenancy_ocid,
+                root_compartment_ocid=app_config.root_compartment_ocid,
+                include_subcompartments=app_config.include_subcompartments,
+            )
+        except Exception as exc:  # noqa: BLE001
+            print(f"[ERROR] Failed to list compartments: {exc}")
+            return 1
 
     print(f"[INFO] Discovered {len(compartments)} accessible compartments.")
 
-    scanned_compartments: list[dict[str, Any]] = []
+    output_dir = Path(app_config.output_dir)
+    previous_report_path = find_latest_report(output_dir)
+    hints = load_previous_scan_hints(previous_report_path)
+    time_budget = args.time_budget if args.time_budget is not None else app_config.scan_time_budget_seconds
+
+    scan = scan_compartments(
+        compartments=compartments,
+        app_config=app_config,
+        clients=clients,
+        hints=hints,
+        deadline=ScanDeadline(time_budget, started_at=started_at),
+        profiler=profiler,
+    )
+
+    return publish_report(
+        args=args,
+        app_config=app_config,
+        clients=clients,
+        region=region,
+        tenancy_ocid=tenancy_ocid,
+        compartment_ids=[item.id for item in compartments],
+        scan=scan,
+        profiler=profiler,
+        previous_report_path=previous_report_path,
+    )
+
+
+def scan_compartments(
+    compartments: list[CompartmentInfo],
+    app_config: AppConfig,
+    clients: dict[str, Any],
+    hints: dict[str, set[str]],
+    deadline: ScanDeadline,
+    profiler: PhaseProfiler,
+    network_seed: dict[str, dict[str, dict[str, Any]]] | None = None,
+) -> dict[str, Any]:
+    lb_collector = LoadBalancerCollector(clients["load_balancer"])
+    infra_collector = InfraCollector(clients["compute"], clients["network"])
+    breaker = CircuitBreaker(app_config.circuit_breaker_threshold)
+    health_executor = ThreadPoolExecutor(max_workers=app_config.lb_health_fanout, thread_name_prefix="lb-health")
+
+    ordered_compartments = prioritize_compartments(
+        compartments,
+        critical_compartments=app_config.critical_compartments,
+        previous_lb_compartment_ids=hints["lb_compartment_ids"],
+    )
+
     skipped_compartments: list[dict[str, str]] = []
+    listed_compartments: list[CompartmentInfo] = []
+    work_items: list[tuple[int, CompartmentInfo, Any]] = []
+    subnets_by_compartment: dict[str, dict[str, dict[str, Any]]] = {}
+    cidr_index = SubnetCidrIndex()
+    network_resolver = NetworkReferenceResolver(clients["network"])
+    if network_seed is not None:
+        # Distributed workers get the whole job's subnets and NSGs, so backend correlation does
+        # not depend on which shard the network compartment landed in.
+        network_resolver.seed_subnets(network_seed["subnets"])
+        network_resolver.seed_nsgs(network_seed["nsgs"])
+        for subnet in network_seed["subnets"].values():
+            cidr_index.add_subnet(subnet)
 
-    for index, compartment in enumerate(compartments, start=1):
-        print(f"[INFO] [{index}/{len(compartments)}] Processing compartment: {compartment.name}")
+    with profiler.phase("lb_discovery"):
+        for index, compartment in enumerate(ordered_compartments, start=1):
+            if deadline.expired():
+                print(f"[WARN] Scan time budget exhausted during LB discovery ({len(compartments) - index + 1} compartments not listed).")
+                break
 
-        try:
-            infra = infra_collector.build_context(compartment.id)
-        except Exception as exc:  # noqa: BLE001
-            skipped_compartments.append(
-                {
-                    "compartment_id": compartment.id,
-                    "reason": f"infra collection failed: {exc}",
-                }
-            )
-            print(f"[WARN] Skipping compartment infra collection: {compartment.name} ({exc})")
-            continue
+            print(f"[INFO] [{index}/{len(compartments)}] Listing load balancers in compartment: {compartment.name}")
 
-        try:
-            lb_summaries = lb_collector.list_load_balancers(compartment.id)
-        except Exception as exc:  # noqa: BLE001
-            skipped_compartments.append(
-                {
-                    "compartment_id": compartment.id,
-                    "reason": f"load balancer listing failed: {exc}",
-                }
-            )
-            print(f"[WARN] Skipping compartment LB listing: {compartment.name} ({exc})")
-            continue
+            try:
+                lb_summaries = lb_collector.list_load_balancers(compartment.id)
+            except Exception as exc:  # noqa: BLE001
+                skipped_compartments.append(
+                    {
+                        "compartment_id": compartment.id,
+                        "reason": f"load balancer listing failed: {exc}",
+                    }
+                )
+                print(f"[WARN] Skipping compartment LB listing: {compartment.name} ({exc})")
+                continue
+
+            listed_compartments.append(compartment)
+
+            try:
+                subnets_by_compartment[compartment.id] = infra_collector.list_subnets(compartment.id)
+            except Exception as exc:  # noqa: BLE001
+                print(f"[WARN] Failed to list subnets in compartment {compartment.name}: {exc}")
+            else:
+                network_resolver.seed_subnets(subnets_by_compartment[compartment.id])
+                for subnet in subnets_by_compartment[compartment.id].values():
+                    cidr_index.add_subnet(subnet)
+            for lb_summary in lb_summaries:
+                priority = lb_priority(
+                    lb_summary,
+                    compartment,
+                    previous_issue_lb_ids=hints["issue_lb_ids"],
+                    critical_compartments=app_config.critical_compartments,
+                )
+                work_items.append((priority, compartment, lb_summary))
+
+        work_items.sort(key=lambda item: item[0])
+        cidr_index.build()
+
+    infra_by_compartment: dict[str, dict[str, Any] | None] = {}
+    lb_rows_by_compartment: dict[str, list[dict[str, Any]]] = {item.id: [] for item in listed_compartments}
+    scanned_lb_ids: set[str] = set()
+    unscanned_lb_ids: list[str] = []
+
+    with profiler.phase("lb_collection"):
+        for position, (_, compartment, lb_summary) in enumerate(work_items, start=1):
+            if deadline.expired():
+                print(f"[WARN] Scan time budget exhausted ({len(work_items) - position + 1} load balancers not scanned).")
+                unscanned_lb_ids.extend(item[2].id for item in work_items[position - 1 :])
+                break
+
+            if compartment.id not in infra_by_compartment:
+                try:
+                    infra_by_compartment[compartment.id] = infra_collector.build_context(
+                        compartment.id,
+                        subnet_by_id=subnets_by_compartment.get(compartment.id),
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    infra_by_compartment[compartment.id] = None
+                    skipped_compartments.append(
+                        {
+                            "compartment_id": compartment.id,
+                            "reason": f"infra collection failed: {exc}",
+                        }
+                    )
+                    print(f"[WARN] Skipping compartment infra collection: {compartment.name} ({exc})")
+                else:
+                    network_resolver.seed_nsgs(infra_by_compartment[compartment.id]["nsg_by_id"])
+
+            infra = infra_by_compartment[compartment.id]
+            if infra is None:
+                unscanned_lb_ids.append(lb_summary.id)
+                continue
+
+            print(f"[INFO] [{position}/{len(work_items)}] Collecting LB {lb_summary.display_name} ({compartment.name})")
 
-        lb_rows: list[dict[str, Any]] = []
+            try:
+                lb = breaker.call(compartment.id, "get_load_balancer", lb_collector.get_load_balancer, lb_summary.id)
+            except Exception as exc:  # noqa: BLE001
+                status = CIRCUIT_OPEN_STATUS if isinstance(exc, CircuitOpenError) else "UNAVAILABLE"
+                lb_rows_by_compartment[compartment.id].append(_unavailable_lb_row(lb_summary, status, str(exc)))
+                unscanned_lb_ids.append(lb_summary.id)
+                print(f"[WARN] Failed to fetch LB {lb_summary.display_name}: {exc}")
+                continue
 
-        for lb_summary in lb_summaries:
             try:
-                lb = lb_collector.get_load_balancer(lb_summary.id)
-                lb_rows.append(
+                lb_rows_by_compartment[compartment.id].append(
                     _collect_lb_detail(
                         lb=lb,
                         lb_collector=lb_collector,
+                        compartment_id=compartment.id,
+                        breaker=breaker,
+                        health_executor=health_executor,
+                        cidr_index=cidr_index,
+                        network_resolver=network_resolver,
                         ip_to_instance=infra["ip_to_instance"],
-                        subnet_by_id=infra["subnet_by_id"],
-                        nsg_by_id=infra["nsg_by_id"],
                     )
                 )
             except Exception as exc:  # noqa: BLE001
+                unscanned_lb_ids.append(lb_summary.id)
                 print(f"[WARN] Failed to collect LB {lb_summary.display_name}: {exc}")
+            else:
+                scanned_lb_ids.add(lb_summary.id)
 
-        scanned_compartments.append(
-            {
-                "compartment": compartment,
-                "infra": infra,
-                "load_balancers": lb_rows,
-            }
+        network_resolver.close()
+        health_executor.shutdown(wait=True)
+    if any(network_resolver.fetch_counts.values()):
+        print(
+            f"[INFO] Resolved {network_resolver.fetch_counts['subnet']} subnet and "
+            f"{network_resolver.fetch_counts['nsg']} NSG references on demand."
         )
 
-    generated_at = datetime.now(timezone.utc)
-    analyzer = ReadinessAnalyzer()
-    report = analyzer.analyze(
-        generated_at=generated_at,
-        region=region,
-        tenancy_ocid=tenancy_ocid,
-        scanned_compartments=scanned_compartments,
-        skipped_compartments=skipped_compartments,
-    )
+    # The report keeps every listed compartment that produced rows or had nothing left unscanned;
+    # coverage splits those into fully and partially scanned so the two always add up.
+    unscanned_lb_id_set = set(unscanned_lb_ids)
+    unscanned_compartment_ids = {item[1].id for item in work_items if item[2].id in unscanned_lb_id_set}
+    scanned_compartments: list[dict[str, Any]] = [
+        {
+            "compartment": compartment,
+            "infra": infra_by_compartment.get(compartment.id),
+            "load_balancers": lb_rows_by_compartment[compartment.id],
+        }
+        for compartment in sorted(listed_compartments, key=lambda item: item.name.lower())
+        if compartment.id not in unscanned_compartment_ids or lb_rows_by_compartment[compartment.id]
+    ]
 
-    timestamp = generated_at.strftime("%Y%m%dT%H%M%SZ")
+    listed_ids = {item.id for item in listed_compartments}
+    skipped_ids = {item["compartment_id"] for item in skipped_compartments}
+    complete = not unscanned_lb_ids and len(listed_ids | skipped_ids) == len(compartments)
+    coverage = {
+        "complete": complete,
+        "time_budget_seconds": deadline.budget_seconds,
+        "elapsed_seconds": round(deadline.elapsed(), 3),
+        "total_compartments": len(compartments),
+        "scanned_compartments": sum(
+            1 for item in scanned_compartments if item["compartment"].id not in unscanned_compartment_ids
+        ),
+        "partially_scanned_compartments": sum(
+            1 for item in scanned_compartments if item["compartment"].id in unscanned_compartment_ids
+        ),
+        "discovered_load_balancers": len(work_items),
+        "scanned_load_balancers": len(scanned_lb_ids),
+        "unlisted_compartment_ids": [
+            item.id for item in compartments if item.id not in listed_ids and item.id not in skipped_ids
+        ],
+        "unscanned_load_balancer_ids": unscanned_lb_ids,
+        "carried_issue_load_balancer_ids": carry_over_issue_lb_ids(
+            hints["issue_lb_ids"], scanned_lb_ids, unscanned_lb_id_set, complete
+        ),
+    }
+
+    if not coverage["complete"]:
+        print(
+            f"[WARN] Partial report: {coverage['scanned_compartments']}/{coverage['total_compartments']} compartments "
+            f"fully scanned ({coverage['partially_scanned_compartments']} partially), "
+            f"{coverage['scanned_load_balancers']}/{coverage['discovered_load_balancers']} discovered LBs scanned."
+        )
+
+    return {
+        "scanned_compartments": scanned_compartments,
+        "skipped_compartments": skipped_compartments,
+        "coverage": coverage,
+        "circuit_breakers": breaker.report(),
+    }
+
+
+def publish_report(
+    args: argparse.Namespace,
+    app_config: AppConfig,
+    clients: dict[str, Any],
+    region: str,
+    tenancy_ocid: str,
+    compartment_ids: list[str],
+    scan: dict[str, Any],
+    profiler: PhaseProfiler,
+    previous_report_path: Path | None,
+) -> int:
     output_dir = Path(app_config.output_dir)
-    json_path = output_dir / f"lb_readiness_report_{timestamp}.json"
-    markdown_path = output_dir / f"lb_readiness_report_{timestamp}.md"
 
-    write_json_report(report, json_path)
-    write_markdown_report(report, markdown_path)
+    with profiler.phase("analyze"):
+        generated_at = datetime.now(timezone.utc)
+        analyzer = ReadinessAnalyzer()
+        report = analyzer.analyze(
+            generated_at=generated_at,
+            region=region,
+            tenancy_ocid=tenancy_ocid,
+            scanned_compartments=scan["scanned_compartments"],
+            skipped_compartments=scan["skipped_compartments"],
+            coverage=scan["coverage"],
+            circuit_breakers=scan["circuit_breakers"],
+        )
+
+    timestamp = generated_at.strftime("%Y%m%dT%H%M%SZ")
+    with profiler.phase("write_artifacts"):
+        artifacts = write_report_artifacts(report, output_dir, f"lb_readiness_report_{timestamp}")
+    json_path = artifacts["json"]
 
     print(f"[INFO] JSON report written: {json_path}")
-    print(f"[INFO] Markdown report written: {markdown_path}")
+    print(f"[INFO] Markdown report written: {artifacts['markdown']}")
+    print(f"[INFO] Backend CSV written: {artifacts['backends_csv']}")
+    print(f"[INFO] Listener CSV written: {artifacts['listeners_csv']}")
+
+    upload_artifacts: list[tuple[Path, str]] = [
+        (json_path, "application/json"),
+        (artifacts["markdown"], "text/markdown"),
+        (artifacts["backends_csv"], "text/csv"),
+        (artifacts["listeners_csv"], "text/csv"),
+    ]
+
+    baseline_path = Path(args.baseline_report) if args.baseline_report else None
+    if baseline_path is None and args.upload_delta_only:
+        baseline_path = previous_report_path
+    if baseline_path is not None:
+        diff_path = output_dir / f"lb_readiness_diff_{timestamp}.json"
+        try:
+            delta = ReportDiffer().diff(baseline_path, json_path)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[WARN] Failed to diff against baseline report {baseline_path}: {exc}")
+        else:
+            write_json_report(delta, diff_path)
+            print(f"[INFO] Delta report written: {diff_path} (baseline: {baseline_path})")
+            if args.upload_delta_only:
+                upload_artifacts = [(diff_path, "application/json")]
+    elif args.upload_delta_only:
+        print("[WARN] No baseline report available; uploading the full report instead of a delta.")
+
+    for profile_path in profiler.write(output_dir, f"lb_readiness_report_{timestamp}"):
+        print(f"[INFO] Profile written: {profile_path}")
 
     if args.skip_upload:
         print("[INFO] Upload skipped (--skip-upload).")
         return 0
 
+    return upload_report_artifacts(
+        app_config=app_config,
+        object_storage_client=clients["object_storage"],
+        compartment_ids=compartment_ids,
+        artifacts=upload_artifacts,
+    )
+
+
+def upload_report_artifacts(
+    app_config: AppConfig,
+    object_storage_client: Any,
+    compartment_ids: list[str],
+    artifacts: list[tuple[Path, str]],
+) -> int:
     try:
-        namespace = app_config.object_storage_namespace or clients["object_storage"].get_namespace().data
+        namespace = app_config.object_storage_namespace or object_storage_client.get_namespace().data
     except Exception as exc:  # noqa: BLE001
         print(f"[ERROR] Failed to resolve Object Storage namespace: {exc}")
         return 2 if app_config.fail_on_upload_error else 0
@@ -313,9 +782,9 @@ def main() -> int:
 
     if app_config.auto_discover_bucket:
         discovered = discover_candidate_buckets(
-            object_storage_client=clients["object_storage"],
+            object_storage_client=object_storage_client,
             namespace=namespace,
-            compartment_ids=[item.id for item in compartments],
+            compartment_ids=compartment_ids,
         )
         for bucket in discovered:
             if bucket not in bucket_candidates:
@@ -330,7 +799,7 @@ def main() -> int:
 
     for bucket in bucket_candidates:
         uploader = ObjectStorageUploader(
-            object_storage_client=clients["object_storage"],
+            object_storage_client=object_storage_client,
             namespace=namespace,
             bucket=bucket,
             prefix=app_config.object_storage_prefix,
@@ -339,10 +808,9 @@ def main() -> int:
         print(f"[INFO] Attempting upload using bucket: {bucket}")
 
         try:
-            json_result = uploader.upload_file(json_path, "application/json")
-            md_result = uploader.upload_file(markdown_path, "text/markdown")
-            print(f"[INFO] Uploaded: {json_result.uri}")
-            print(f"[INFO] Uploaded: {md_result.uri}")
+            results = [uploader.upload_file(path, content_type) for path, content_type in artifacts]
+            for result in results:
+                print(f"[INFO] Uploaded: {result.uri}")
             upload_success = True
             break
         except Exception as exc:  # noqa: BLE001
@@ -359,5 +827,383 @@ def main() -> int:
     return 0
 
 
+def run_diff(args: argparse.Namespace) -> int:
+    base_path, current_path = (Path(item) for item in args.diff)
+
+    try:
+        app_config = AppConfig.from_env()
+        delta = ReportDiffer().diff(base_path, current_path)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to diff reports: {exc}")
+        return 1
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    diff_path = Path(app_config.output_dir) / f"lb_readiness_diff_{timestamp}.json"
+    write_json_report(delta, diff_path)
+
+    summary = delta["summary"]
+    print(
+        f"[INFO] Added LBs: {summary['added_load_balancers']}, removed LBs: {summary['removed_load_balancers']}, "
+        f"not scanned LBs: {summary['not_scanned_load_balancers']}, "
+        f"health changes: {summary['health_changes']}, instance mapping changes: {summary['instance_mapping_changes']}"
+    )
+    print(f"[INFO] Delta report written: {diff_path}")
+
+    if args.skip_upload:
+        print("[INFO] Upload skipped (--skip-upload).")
+        return 0
+
+    try:
+        oci_config = create_oci_config(app_config)
+        clients = create_clients(oci_config)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to initialize: {exc}")
+        return 1
+
+    return upload_report_artifacts(
+        app_config=app_config,
+        object_storage_client=clients["object_storage"],
+        compartment_ids=[app_config.root_compartment_ocid or oci_config["tenancy"]],
+        artifacts=[(diff_path, "application/json")],
+    )
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    try:
+        app_config = AppConfig.from_env()
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to initialize: {exc}")
+        return 1
+
+    output_dir = Path(app_config.output_dir)
+    report_path = Path(args.report) if args.report else find_latest_report(output_dir)
+    if report_path is None:
+        print(f"[ERROR] No report found in {output_dir}; run a scan first or pass --report.")
+        return 1
+
+    try:
+        index = ReportIndex(report_path)
+        server = ReportQueryServer((args.host, args.port), index)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to start query server: {exc}")
+        return 1
+
+    print(f"[INFO] Loaded report: {report_path} ({index.load_balancer_count} load balancers)")
+
+    watcher = None
+    if args.watch_interval > 0:
+        watcher = ReportWatcher(
+            server,
+            output_dir=output_dir,
+            report_path=Path(args.report) if args.report else None,
+            interval_seconds=args.watch_interval,
+        )
+        watcher.start()
+
+    print(f"[INFO] Serving readiness queries on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] Shutting down query server.")
+    finally:
+        if watcher is not None:
+            watcher.stop_event.set()
+        server.server_close()
+
+    return 0
+
+
+def _list_network_seed(infra_collector: InfraCollector, compartments: list[CompartmentInfo]) -> dict[str, Any]:
+    def list_compartment(compartment: CompartmentInfo) -> tuple[dict[str, Any], dict[str, Any]]:
+        try:
+            return infra_collector.list_subnets(compartment.id), infra_collector.list_nsgs(compartment.id)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[WARN] Failed to list subnets/NSGs in compartment {compartment.name}: {exc}")
+            return {}, {}
+
+    seed: dict[str, Any] = {"subnets": {}, "nsgs": {}}
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix="network-seed") as executor:
+        for subnets, nsgs in executor.map(list_compartment, compartments):
+            seed["subnets"].update(subnets)
+            seed["nsgs"].update(nsgs)
+    return seed
+
+
+def _serialize_scan(scan: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "scanned_compartments": [
+            {
+                "compartment": {"id": item["compartment"].id, "name": item["compartment"].name},
+                "infra": {
+                    "instance_count": item["infra"]["instance_count"],
+                    "vnic_attachment_count": item["infra"]["vnic_attachment_count"],
+                }
+                if item["infra"]
+                else None,
+                "load_balancers": item["load_balancers"],
+            }
+            for item in scan["scanned_compartments"]
+        ],
+        "skipped_compartments": scan["skipped_compartments"],
+        "coverage": scan["coverage"],
+        "circuit_breakers": scan["circuit_breakers"],
+    }
+
+
+def _merge_shard_results(
+    shards: list[dict[str, Any]],
+    results: dict[str, dict[str, Any]],
+    hints: dict[str, set[str]],
+    time_budget: float | None,
+    elapsed_seconds: float,
+) -> dict[str, Any]:
+    scanned_compartments: list[dict[str, Any]] = []
+    skipped_compartments: list[dict[str, str]] = []
+    circuit_breakers: list[dict[str, Any]] = []
+    coverage: dict[str, Any] = {
+        "complete": True,
+        "time_budget_seconds": time_budget,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "total_compartments": 0,
+        "scanned_compartments": 0,
+        "partially_scanned_compartments": 0,
+        "discovered_load_balancers": 0,
+        "scanned_load_balancers": 0,
+        "unlisted_compartment_ids": [],
+        "unscanned_load_balancer_ids": [],
+        "carried_issue_load_balancer_ids": [],
+        "total_shards": len(shards),
+        "completed_shards": 0,
+    }
+
+    for shard in shards:
+        result = results.get(shard["shard_id"])
+        if result is None:
+            coverage["complete"] = False
+            coverage["total_compartments"] += len(shard["compartments"])
+            coverage["unlisted_compartment_ids"].extend(item["id"] for item in shard["compartments"])
+            continue
+
+        coverage["completed_shards"] += 1
+        shard_coverage = result["coverage"]
+        coverage["complete"] = coverage["complete"] and shard_coverage["complete"]
+        for key in (
+            "total_compartments",
+            "scanned_compartments",
+            "partially_scanned_compartments",
+            "discovered_load_balancers",
+            "scanned_load_balancers",
+        ):
+            coverage[key] += shard_coverage[key]
+        coverage["unlisted_compartment_ids"].extend(shard_coverage["unlisted_compartment_ids"])
+        coverage["unscanned_load_balancer_ids"].extend(shard_coverage["unscanned_load_balancer_ids"])
+
+        for item in result["scanned_compartments"]:
+            scanned_compartments.append({**item, "compartment": CompartmentInfo(**item["compartment"])})
+        skipped_compartments.extend(result["skipped_compartments"])
+        circuit_breakers.extend(result["circuit_breakers"])
+
+    scanned_compartments.sort(key=lambda item: item["compartment"].name.lower())
+    # Shards only know their own LBs, so the carry-over is recomputed across all of them.
+    coverage["carried_issue_load_balancer_ids"] = carry_over_issue_lb_ids(
+        hints["issue_lb_ids"],
+        {lb["load_balancer_id"] for item in scanned_compartments for lb in item["load_balancers"]},
+        set(coverage["unscanned_load_balancer_ids"]),
+        coverage["complete"],
+    )
+    return {
+        "scanned_compartments": scanned_compartments,
+        "skipped_compartments": skipped_compartments,
+        "coverage": coverage,
+        "circuit_breakers": circuit_breakers,
+    }
+
+
+def run_coordinator(args: argparse.Namespace) -> int:
+    started_at = time.monotonic()
+    try:
+        app_config = AppConfig.from_env()
+        oci_config = create_oci_config(app_config)
+        clients = create_clients(oci_config)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to initialize: {exc}")
+        return 1
+
+    tenancy_ocid = oci_config["tenancy"]
+    try:
+        compartments = IdentityCollector(clients["identity"]).list_compartments(
+            tenancy_ocid=tenancy_ocid,
+            root_compartment_ocid=app_config.root_compartment_ocid,
+            include_subcompartments=app_config.include_subcompartments,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to list compartments: {exc}")
+        return 1
+
+    output_dir = Path(app_config.output_dir)
+    previous_report_path = find_latest_report(output_dir)
+    hints = load_previous_scan_hints(previous_report_path)
+    time_budget = args.time_budget if args.time_budget is not None else app_config.scan_time_budget_seconds
+
+    network_seed = _list_network_seed(InfraCollector(clients["compute"], clients["network"]), compartments)
+    print(
+        f"[INFO] Listed {len(network_seed['subnets'])} subnets and {len(network_seed['nsgs'])} NSGs for the workers."
+    )
+
+    # Deal prioritized compartments round-robin so every shard gets a share of the important ones.
+    ordered = prioritize_compartments(compartments, app_config.critical_compartments, hints["lb_compartment_ids"])
+    shard_count = max(1, min(args.shards, len(ordered)))
+    shards = [
+        {
+            "shard_id": f"shard-{index:04d}",
+            "compartments": [{"id": item.id, "name": item.name} for item in ordered[index::shard_count]],
+        }
+        for index in range(shard_count)
+    ]
+
+    queue = ShardQueue(Path(args.queue_dir))
+    queue.create_job(
+        {
+            "tenancy_ocid": tenancy_ocid,
+            "region": oci_config["region"],
+            "time_budget_seconds": time_budget,
+            # One wall-clock deadline for the whole job, so a worker claiming its third shard does
+            # not restart the budget. Hosts are expected to have synchronized clocks.
+            "deadline_epoch": (
+                time.time() + max(0.0, time_budget - (time.monotonic() - started_at))
+                if time_budget is not None
+                else None
+            ),
+            "heartbeat_interval_seconds": max(1.0, args.worker_timeout / 3),
+            "issue_lb_ids": sorted(hints["issue_lb_ids"]),
+            "lb_compartment_ids": sorted(hints["lb_compartment_ids"]),
+        },
+        shards,
+        network_seed,
+    )
+    print(f"[INFO] Queued {len(compartments)} compartments in {shard_count} shards on {args.queue_dir}")
+
+    # Workers stop at the job deadline; allow one more worker timeout for their results to land.
+    deadline = ScanDeadline(time_budget + args.worker_timeout if time_budget is not None else None, started_at=started_at)
+    shard_ids = {item["shard_id"] for item in shards}
+    reported = 0
+    # The deadline never fires without a time budget, so also give up once no worker has held
+    # a shard for a whole --worker-timeout.
+    idle_since = time.monotonic()
+
+    while True:
+        completed = queue.completed_ids() & shard_ids
+        if len(completed) != reported:
+            reported = len(completed)
+            idle_since = time.monotonic()
+            print(f"[INFO] Shards completed: {reported}/{shard_count}")
+        if completed | (queue.failed_ids() & shard_ids) == shard_ids:
+            break
+        if deadline.expired():
+            print(f"[WARN] Coordinator deadline reached with {shard_count - len(completed)} shards outstanding.")
+            break
+        if queue.claimed_ids():
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since >= args.worker_timeout:
+            print(
+                f"[WARN] No worker has held a shard for {args.worker_timeout:.0f}s; "
+                f"{shard_count - len(completed)} shards outstanding."
+            )
+            break
+        requeued, abandoned = queue.requeue_stale(args.worker_timeout, args.max_attempts)
+        for shard_id in requeued:
+            print(f"[WARN] Re-queued {shard_id}: worker heartbeat timed out.")
+        for shard_id in abandoned:
+            print(f"[ERROR] Giving up on {shard_id} after {args.max_attempts} attempts.")
+        time.sleep(args.poll_interval)
+
+    queue.mark_complete()
+    queue.discard_pending()
+
+    results = queue.load_results()
+    if not results:
+        print("[ERROR] No shard results were produced; no report written.")
+        return 1
+
+    scan = _merge_shard_results(shards, results, hints, time_budget, deadline.elapsed())
+    if not scan["coverage"]["complete"]:
+        coverage = scan["coverage"]
+        print(
+            f"[WARN] Partial report: {coverage['completed_shards']}/{coverage['total_shards']} shards, "
+            f"{coverage['scanned_load_balancers']}/{coverage['discovered_load_balancers']} discovered LBs scanned."
+        )
+
+    return publish_report(
+        args=args,
+        app_config=app_config,
+        clients=clients,
+        region=oci_config["region"],
+        tenancy_ocid=tenancy_ocid,
+        compartment_ids=[item.id for item in compartments],
+        scan=scan,
+        profiler=PhaseProfiler(args.profile),
+        previous_report_path=previous_report_path,
+    )
+
+
+def run_worker(args: argparse.Namespace) -> int:
+    try:
+        app_config = AppConfig.from_env()
+        oci_config = create_oci_config(app_config)
+        clients = create_clients(oci_config)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[ERROR] Failed to initialize: {exc}")
+        return 1
+
+    queue = ShardQueue(Path(args.queue_dir))
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    print(f"[INFO] Worker {worker_id} polling {args.queue_dir}")
+    seed_job_id: str | None = None
+    network_seed: dict[str, Any] | None = None
+
+    while True:
+        job = queue.read_job()
+        if job is not None and job["complete"]:
+            print(f"[INFO] Job complete; worker {worker_id} exiting.")
+            return 0
+
+        # Past the job deadline, leave remaining shards for the coordinator to report as unscanned.
+        claimable = job is not None and (job["deadline_epoch"] is None or time.time() < job["deadline_epoch"])
+        shard = queue.claim() if claimable else None
+        if shard is None:
+            time.sleep(args.poll_interval)
+            continue
+
+        if job["job_id"] != seed_job_id:
+            network_seed = queue.read_network_seed()
+            seed_job_id = job["job_id"]
+        remaining = None if job["deadline_epoch"] is None else max(0.0, job["deadline_epoch"] - time.time())
+
+        print(f"[INFO] Worker {worker_id} claimed {shard['shard_id']} ({len(shard['compartments'])} compartments)")
+        stop_heartbeat = queue.heartbeat(shard["shard_id"], job["heartbeat_interval_seconds"])
+        try:
+            scan = scan_compartments(
+                compartments=[CompartmentInfo(**item) for item in shard["compartments"]],
+                app_config=app_config,
+                clients=clients,
+                hints={
+                    "issue_lb_ids": set(job["issue_lb_ids"]),
+                    "lb_compartment_ids": set(job["lb_compartment_ids"]),
+                },
+                deadline=ScanDeadline(remaining),
+                profiler=PhaseProfiler(None),
+                network_seed=network_seed,
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Leave the claim to expire so the coordinator re-queues the shard.
+            print(f"[ERROR] Worker {worker_id} failed on {shard['shard_id']}: {exc}")
+            continue
+        finally:
+            stop_heartbeat.set()
+
+        queue.complete(shard["shard_id"], {"shard_id": shard["shard_id"], "worker_id": worker_id, **_serialize_scan(scan)})
+        print(f"[INFO] Worker {worker_id} completed {shard['shard_id']}")
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+﻿from __future__ import annotations
+
+import ipaddress
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.oci_lb_readiness_reporter.helpers.cidr_index import (  # noqa: E402
+    NETWORK_MATCH_AMBIGUOUS,
+    NETWORK_MATCH_INVALID_IP,
+    NETWORK_MATCH_OUTSIDE,
+    NETWORK_MATCH_SUBNET,
+    SubnetCidrIndex,
+)
+
+
+def _subnet(subnet_id: str, vcn_id: str, *cidr_blocks: str) -> dict[str, Any]:
+    return {"id": subnet_id, "display_name": subnet_id, "vcn_id": vcn_id, "cidr_blocks": list(cidr_blocks)}
+
+
+def _brute_force(subnets: list[dict[str, Any]], ip_address: str) -> set[str]:
+    address = ipaddress.ip_address(ip_address)
+    best_prefix = -1
+    matches: set[str] = set()
+    for subnet in subnets:
+        for cidr in subnet["cidr_blocks"]:
+            network = ipaddress.ip_network(cidr, strict=False)
+            if network.version != address.version or address not in network:
+                continue
+            if network.prefixlen > best_prefix:
+                best_prefix, matches = network.prefixlen, {subnet["id"]}
+            elif network.prefixlen == best_prefix:
+                matches.add(subnet["id"])
+    return matches
+
+
+def test_lookup_matches_brute_force_for_nested_and_disjoint_blocks() -> None:
+    rnd = random.Random(0)
+    subnets = [
+        _subnet("vcn-wide", "vcn-a", "10.0.0.0/8"),
+        _subnet("app", "vcn-a", "10.1.0.0/16"),
+        _subnet("app-web", "vcn-a", "10.1.2.0/24"),
+        _subnet("app-web-dup", "vcn-b", "10.1.2.0/24"),
+        _subnet("db", "vcn-a", "10.2.0.0/16", "10.3.0.0/24"),
+        _subnet("other", "vcn-c", "192.168.0.0/16"),
+        _subnet("v6", "vcn-a", "2001:db8::/32"),
+        _subnet("v6-inner", "vcn-a", "2001:db8:1::/48"),
+    ]
+    index = SubnetCidrIndex()
+    for subnet in subnets:
+        index.add_subnet(subnet)
+
+    probes = [f"10.{rnd.randrange(5)}.{rnd.randrange(4)}.{rnd.randrange(256)}" for _ in range(500)]
+    probes += [f"192.168.{rnd.randrange(256)}.1", "172.16.0.1", "11.0.0.0", "9.255.255.255", "10.255.255.255"]
+    probes += [f"2001:db8:{rnd.randrange(3):x}::{rnd.randrange(1 << 16):x}" for _ in range(100)]
+    probes += ["2001:db9::1", "::1"]
+
+    for ip_address in probes:
+        assert {item["subnet_id"] for item in index.lookup(ip_address)} == _brute_force(subnets, ip_address), ip_address
+
+
+def test_resolve_prefers_lb_vcn_for_duplicate_cidrs() -> None:
+    index = SubnetCidrIndex()
+    index.add_subnet(_subnet("web-a", "vcn-a", "10.1.2.0/24"))
+    index.add_subnet(_subnet("web-b", "vcn-b", "10.1.2.0/24"))
+
+    preferred = index.resolve("10.1.2.7", {"vcn-b"})
+    assert preferred["network_match"] == NETWORK_MATCH_SUBNET
+    assert preferred["resolved_subnet_id"] == "web-b"
+    assert index.resolve("10.1.2.7", {"vcn-z"})["network_match"] == NETWORK_MATCH_AMBIGUOUS
+
+
+def test_resolve_reports_outside_and_invalid_addresses() -> None:
+    index = SubnetCidrIndex()
+    index.add_subnet(_subnet("app", "vcn-a", "10.1.0.0/16"))
+
+    assert index.resolve("10.2.0.1", {"vcn-a"})["network_match"] == NETWORK_MATCH_OUTSIDE
+    assert index.resolve("not-an-ip", {"vcn-a"})["network_match"] == NETWORK_MATCH_INVALID_IP
+    assert index.resolve(None, {"vcn-a"})["network_match"] == NETWORK_MATCH_INVALID_IP
+
+
+def test_subnets_added_after_lookup_are_indexed() -> None:
+    index = SubnetCidrIndex()
+    index.add_subnet(_subnet("app", "vcn-a", "10.1.0.0/16"))
+    assert index.lookup("10.9.0.5") == []
+
+    index.add_subnet(_subnet("central", "vcn-c", "10.9.0.0/24"))
+    index.add_subnet(_subnet("central", "vcn-c", "10.9.0.0/24"))
+    assert [item["subnet_id"] for item in index.lookup("10.9.0.5")] == ["central"]
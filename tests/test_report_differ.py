@@ -0,0 +1,96 @@
+﻿from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.oci_lb_readiness_reporter.analyzers import ReportDiffer  # noqa: E402
+
+
+def _lb(lb_id: str, compartment_id: str, status: str = "OK", **extra: Any) -> dict[str, Any]:
+    return {
+        "load_balancer_id": lb_id,
+        "display_name": lb_id,
+        "compartment_id": compartment_id,
+        "compartment_name": compartment_id,
+        "backend_sets": [
+            {
+                "name": "bs",
+                "health_status": status,
+                "backends": [{"name": "10.0.0.1:80", "health_status": status, "mapped_instance_id": "inst"}],
+            }
+        ],
+        **extra,
+    }
+
+
+def _write(path: Path, load_balancers: list[dict[str, Any]], **sections: Any) -> Path:
+    path.write_text(
+        json.dumps({"metadata": {"generated_at_utc": path.stem}, **sections, "load_balancers": load_balancers}),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _ids(items: list[dict[str, Any]]) -> list[str]:
+    return sorted(item["load_balancer_id"] for item in items)
+
+
+def test_partial_report_marks_unreached_lbs_as_not_scanned(tmp_path: Path) -> None:
+    base = _write(
+        tmp_path / "base.json",
+        [
+            _lb("lb-ok", "c1"),
+            _lb("lb-deleted", "c1"),
+            _lb("lb-budget", "c1"),
+            _lb("lb-unlisted", "c2"),
+            _lb("lb-skipped", "c3"),
+            _lb("lb-circuit", "c4"),
+        ],
+    )
+    current = _write(
+        tmp_path / "current.json",
+        [
+            _lb("lb-ok", "c1", status="CRITICAL"),
+            _lb("lb-new", "c1"),
+            {
+                **_lb("lb-circuit", "c4"),
+                "backend_sets": [],
+                "collection_status": "UNAVAILABLE (circuit open)",
+            },
+        ],
+        coverage={
+            "complete": False,
+            "unscanned_load_balancer_ids": ["lb-budget", "lb-circuit"],
+            "unlisted_compartment_ids": ["c2"],
+        },
+        skipped_compartments=[{"compartment_id": "c3", "reason": "load balancer listing failed"}],
+    )
+
+    delta = ReportDiffer().diff(base, current)
+
+    assert _ids(delta["added_load_balancers"]) == ["lb-new"]
+    assert _ids(delta["removed_load_balancers"]) == ["lb-deleted"]
+    assert _ids(delta["not_scanned_load_balancers"]) == ["lb-budget", "lb-circuit", "lb-skipped", "lb-unlisted"]
+    assert {(item["load_balancer_id"], item["current_status"]) for item in delta["health_changes"]} == {
+        ("lb-ok", "CRITICAL")
+    }
+    assert delta["summary"]["not_scanned_load_balancers"] == 4
+
+
+def test_complete_report_reports_missing_lbs_as_removed(tmp_path: Path) -> None:
+    base = _write(tmp_path / "base.json", [_lb("lb-a", "c1"), _lb("lb-b", "c1")])
+    current = _write(
+        tmp_path / "current.json",
+        [_lb("lb-a", "c1")],
+        coverage={"complete": True, "unscanned_load_balancer_ids": [], "unlisted_compartment_ids": []},
+    )
+
+    delta = ReportDiffer().diff(base, current)
+
+    assert _ids(delta["removed_load_balancers"]) == ["lb-b"]
+    assert delta["not_scanned_load_balancers"] == []
+    assert delta["summary"]["unchanged_load_balancers"] == 1
@@ -0,0 +1,56 @@
+﻿from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.oci_lb_readiness_reporter.helpers.report_stream import iter_report_items  # noqa: E402
+
+REPORT: dict[str, Any] = {
+    "metadata": {"report_name": "load_balancer_readiness_report", "region": "eu-frankfurt-1"},
+    "summary": {"total_load_balancers": 3, "ratio": 0.125, "scan_complete": True, "max_skew": None},
+    "coverage": None,
+    "skipped_compartments": [],
+    "issue_load_balancers": [{"load_balancer_id": "ocid1.loadbalancer.oc1..b", "note": "comma, \"quoted\" ] }"}],
+    "load_balancers": [
+        {"load_balancer_id": "ocid1.loadbalancer.oc1..a", "display_name": "lb-ä", "backend_sets": []},
+        {"load_balancer_id": "ocid1.loadbalancer.oc1..b", "display_name": "lb-b", "backend_count": 123456789},
+        12345,
+        -1.5e-3,
+        "tail",
+        False,
+    ],
+    "total": 1234567890,
+}
+
+
+def _expected_items() -> list[tuple[str, Any]]:
+    items: list[tuple[str, Any]] = []
+    for key, value in REPORT.items():
+        if isinstance(value, list):
+            items.extend((key, item) for item in value)
+        else:
+            items.append((key, value))
+    return items
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_iter_report_items_round_trips_across_chunk_sizes(tmp_path: Path, chunk_size: int, indent: int | None) -> None:
+    report_path = tmp_path / "lb_readiness_report_test.json"
+    report_path.write_text("\ufeff" + json.dumps(REPORT, indent=indent, ensure_ascii=False), encoding="utf-8")
+
+    assert list(iter_report_items(report_path, chunk_size=chunk_size)) == _expected_items()
+
+
+def test_iter_report_items_rejects_truncated_report(tmp_path: Path) -> None:
+    report_path = tmp_path / "lb_readiness_report_test.json"
+    report_path.write_text(json.dumps(REPORT)[:-20], encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_report_items(report_path, chunk_size=7))
@@ -0,0 +1,78 @@
+﻿from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.oci_lb_readiness_reporter.helpers.shard_queue import ShardQueue  # noqa: E402
+
+
+def _queue(tmp_path: Path, *shard_ids: str) -> ShardQueue:
+    queue = ShardQueue(tmp_path / "queue")
+    queue.create_job(
+        {"time_budget_seconds": None},
+        [{"shard_id": shard_id, "compartments": []} for shard_id in shard_ids],
+        {"subnets": [], "nsgs": []},
+    )
+    return queue
+
+
+def _age(path: Path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_requeue_counts_attempts_then_moves_shard_to_failed(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, "shard-000")
+
+    for attempt in (1, 2):
+        shard = queue.claim()
+        assert shard is not None and shard["attempt"] == attempt
+        _age(queue.claimed_dir / "shard-000.json", 60)
+        assert queue.requeue_stale(timeout_seconds=30, max_attempts=3) == (["shard-000"], [])
+
+    assert queue.claim()["attempt"] == 3
+    _age(queue.claimed_dir / "shard-000.json", 60)
+    assert queue.requeue_stale(timeout_seconds=30, max_attempts=3) == ([], ["shard-000"])
+    assert queue.failed_ids() == {"shard-000"}
+    assert queue.claimed_ids() == set()
+    assert queue.claim() is None
+
+
+def test_requeue_leaves_live_claims_alone(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, "shard-000")
+    # A shard that sat in pending/ past the timeout must not look stale the moment it is claimed.
+    _age(queue.pending_dir / "shard-000.json", 60)
+
+    assert queue.claim() is not None
+    assert queue.requeue_stale(timeout_seconds=30, max_attempts=3) == ([], [])
+    assert queue.claimed_ids() == {"shard-000"}
+
+
+def test_already_completed_claim_is_dropped_not_requeued(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, "shard-000", "shard-001")
+    first = queue.claim()
+    assert first["shard_id"] == "shard-000"
+    queue.complete("shard-000", {"shard_id": "shard-000"})
+    # A slow duplicate claim of a finished shard: put it back under claimed/ and let it expire.
+    stale_path = queue.claimed_dir / "shard-000.json"
+    stale_path.write_text(json.dumps(first), encoding="utf-8")
+    _age(stale_path, 60)
+
+    assert queue.requeue_stale(timeout_seconds=30, max_attempts=3) == ([], [])
+    assert queue.claimed_ids() == set()
+    assert queue.completed_ids() == {"shard-000"}
+    assert queue.claim()["shard_id"] == "shard-001"
+
+
+def test_claim_skips_shards_that_already_have_a_result(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, "shard-000", "shard-001")
+    queue.complete("shard-000", {"shard_id": "shard-000"})
+
+    assert queue.claim()["shard_id"] == "shard-001"
+    assert queue.claimed_ids() == {"shard-001"}
+    assert queue.claim() is None